@@ -1,45 +1,96 @@
 import os
+import time
 import aiohttp
 import asyncio
 from dotenv import load_dotenv
 from fastapi import HTTPException
+from rate_limiter import shared_scheduler
+from response_cache import shared_response_cache
+from telemetry import get_logger, UPSTREAM_LATENCY
+
+logger = get_logger(__name__)
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 dotenv_path = os.path.join(current_dir, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
 class BitsCrunchAPIClient:
-    def __init__(self):
+    def __init__(self, scheduler=None, cache=None):
         self.api_key = os.getenv("BITSCRUNCH_API_KEY")
         if not self.api_key:
             raise ValueError("BITSCRUNCH_API_KEY not found in .env file.")
-        self.base_url = "https://api.unleashnfts.com/api/v2"
+        self.base_url = os.getenv("BITSCRUNCH_BASE_URL", "https://api.unleashnfts.com/api/v2")
         self.headers = {
             "x-api-key": self.api_key,
             "Accept": "application/json",
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        self.pool_limit = int(os.getenv("BITSCRUNCH_POOL_LIMIT", "100"))
+        self.pool_limit_per_host = int(os.getenv("BITSCRUNCH_POOL_LIMIT_PER_HOST", "20"))
+        self.dns_cache_ttl = int(os.getenv("BITSCRUNCH_DNS_CACHE_TTL", "300"))
+        self.request_timeout = float(os.getenv("BITSCRUNCH_REQUEST_TIMEOUT", "60"))
+        self._session = None
+        self.scheduler = scheduler or shared_scheduler
+        self.cache = cache or shared_response_cache
+
+    async def start(self):
+        """Opens the pooled keep-alive session. Safe to call more than once."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._session
+
+    async def close(self):
+        """Closes the pooled session and every connection it holds."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
-    async def _make_request(self, endpoint: str, params: dict = None):
+    async def _make_request(self, endpoint: str, params: dict = None, background: bool = False, store: bool = True):
         url = f"{self.base_url}{endpoint}"
-        print(f"Calling bitsCrunch API via aiohttp: {url} with params {params}")
-        await asyncio.sleep(0.25)
-        
+
+        async def fetch():
+            logger.debug("Calling bitsCrunch API via aiohttp: %s with params %s", url, params)
+            return await self.scheduler.run(self.api_key, lambda: self._send(url, endpoint, params), background=background)
+
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url, params=params, timeout=60.0) as response:
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        raise HTTPException(
-                            status_code=response.status,
-                            detail=f"Error from bitsCrunch API ({endpoint}): {error_text}"
-                        )
-                    return await response.json()
+            return await self.cache.get_or_fetch(endpoint, params, fetch, store=store)
         except Exception as err:
             if isinstance(err, HTTPException):
                 raise err
             raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(err)}")
 
+    async def _send(self, url: str, endpoint: str, params: dict = None):
+        session = await self.start()
+        started_at = time.perf_counter()
+        status = "error"
+        try:
+            async with session.get(url, params=params) as response:
+                status = str(response.status)
+                if response.status >= 400:
+                    error_text = await response.text()
+                    retry_after = response.headers.get("Retry-After")
+                    raise HTTPException(
+                        status_code=response.status,
+                        detail=f"Error from bitsCrunch API ({endpoint}): {error_text}",
+                        headers={"Retry-After": retry_after} if retry_after else None
+                    )
+                return await response.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+            # Transient network failures surface as 502 so the scheduler can retry them.
+            raise HTTPException(status_code=502, detail=f"Could not reach bitsCrunch API ({endpoint}): {str(err) or type(err).__name__}")
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - started_at, endpoint=endpoint, status=status)
+
     # --- Market Insights Methods ---
     async def get_market_insights_analytics(self, blockchain: str = "ethereum", time_range: str = "24h"):
         params = {"blockchain": blockchain, "time_range": time_range}
@@ -61,6 +112,19 @@ class BitsCrunchAPIClient:
     async def get_nft_metadata(self, contract_address: str, token_id: str, **kwargs):
         params = {"contract_address": [contract_address], "token_id": [token_id], **kwargs}
         return await self._make_request("/nft/metadata", params)
+
+    async def get_nft_metadata_bulk(self, nfts: list, **kwargs):
+        """
+        Fetches metadata for many (contract_address, token_id) pairs in one call. The combined
+        response isn't cached; nft_metadata caches each item instead.
+        """
+        params = {
+            "contract_address": [contract_address for contract_address, _ in nfts],
+            "token_id": [token_id for _, token_id in nfts],
+            "limit": len(nfts),
+            **kwargs
+        }
+        return await self._make_request("/nft/metadata", params, store=False)
     
     async def get_wallet_nft_balance(self, wallet_address: str, **kwargs):
         params = {"wallet": wallet_address, "limit": 100, **kwargs}
@@ -74,6 +138,6 @@ class BitsCrunchAPIClient:
         params = {"wallet": wallet_address, **kwargs}
         return await self._make_request("/nft/wallet/profile", params)
 
-    async def get_nft_transactions(self, wallet_address: str, **kwargs):
+    async def get_nft_transactions(self, wallet_address: str, background: bool = False, **kwargs):
         params = {"wallet_address": wallet_address, **kwargs}
-        return await self._make_request("/nft/transactions", params)
\ No newline at end of file
+        return await self._make_request("/nft/transactions", params, background=background)
\ No newline at end of file
@@ -0,0 +1,99 @@
+# ai-python/batch_scoring.py
+
+import numpy as np
+from wallet_records import safe_float
+from data_processor import (
+    HIGH_BALANCE_USD,
+    FLAG_SHARK, FLAG_MIXER, FLAG_HIGH_BALANCE, FLAG_WHALE, FLAG_SANCTIONED, FLAG_SANCTION_VOLUME,
+)
+
+RISK_LEVELS = np.array(["Low Risk", "Moderate Risk", "High Risk"])
+WALLET_TYPES = np.array(["Standard", "Shark", "Whale"])
+
+def _float_column(rows: list, key: str, default=None) -> np.ndarray:
+    values = (safe_float(row.get(key, default)) for row in rows)
+    return np.fromiter(values, dtype=np.float64, count=len(rows))
+
+def _bool_column(rows: list, key: str) -> np.ndarray:
+    return np.fromiter((bool(row.get(key, False)) for row in rows), dtype=bool, count=len(rows))
+
+class BatchRiskScores:
+    """
+    Columnar risk scores for many wallets. Produces the same risk level, flags, wallet
+    type and balance strings as `process_and_format_data`, one array per field.
+    """
+
+    def __init__(self, combined_wallet_data_list: list):
+        metrics = [data.get('metrics') or {} for data in combined_wallet_data_list]
+        profiles = [data.get('profile') or {} for data in combined_wallet_data_list]
+        self.size = len(combined_wallet_data_list)
+
+        self.sanction_volume = _float_column(metrics, 'sanction_volume')
+        self.mixer_volume = _float_column(metrics, 'mixer_volume')
+        self.balance_usd = _float_column(metrics, 'balance_usd')
+        self.balance_eth = _float_column(metrics, 'balance', '0') / 1e18
+        self.is_sanctioned = _bool_column(profiles, 'aml_is_sanctioned')
+        self.is_shark = _bool_column(profiles, 'is_shark')
+        self.is_whale = _bool_column(profiles, 'is_whale')
+
+        has_mixer = self.mixer_volume > 0
+        has_sanction_volume = self.sanction_volume > 0
+        has_high_balance = self.balance_usd > HIGH_BALANCE_USD
+
+        moderate = self.is_shark | has_mixer
+        high = self.is_sanctioned | has_sanction_volume | self.is_whale | has_high_balance
+        self.risk_codes = np.where(high, 2, np.where(moderate, 1, 0)).astype(np.int8)
+        self.wallet_type_codes = np.where(self.is_whale, 2, np.where(self.is_shark, 1, 0)).astype(np.int8)
+
+        # Flags are appended kind by kind in the scalar path's order, so each wallet's list matches it.
+        self.risk_flags = [[] for _ in range(self.size)]
+        mixer_values = self.mixer_volume.tolist()
+        sanction_values = self.sanction_volume.tolist()
+        flag_rules = [
+            (self.is_shark, lambda i: FLAG_SHARK),
+            (has_mixer, lambda i: FLAG_MIXER.format(mixer_values[i])),
+            (has_high_balance & ~self.is_whale, lambda i: FLAG_HIGH_BALANCE),
+            (self.is_whale, lambda i: FLAG_WHALE),
+            (self.is_sanctioned, lambda i: FLAG_SANCTIONED),
+            (has_sanction_volume, lambda i: FLAG_SANCTION_VOLUME.format(sanction_values[i])),
+        ]
+        for mask, message in flag_rules:
+            for i in np.flatnonzero(mask).tolist():
+                self.risk_flags[i].append(message(i))
+
+    @property
+    def risk_levels(self) -> list:
+        return RISK_LEVELS[self.risk_codes].tolist()
+
+    @property
+    def wallet_types(self) -> list:
+        return WALLET_TYPES[self.wallet_type_codes].tolist()
+
+    def formatted_balances_usd(self) -> list:
+        return [f"${value:,.2f}" for value in self.balance_usd.tolist()]
+
+    def formatted_balances_eth(self) -> list:
+        return [f"{value:,.4f} ETH" for value in self.balance_eth.tolist()]
+
+    def to_records(self) -> list:
+        """One dict per wallet, using the same keys and strings as the scalar path."""
+        return [
+            {
+                "overall_risk_level": risk_level,
+                "risk_flags": flags,
+                "summary_points": {
+                    "Wallet Type": wallet_type,
+                    "Primary Risk Factor": flags[0] if flags else "None Detected",
+                    "Sanctioned": "Yes" if sanctioned else "No",
+                },
+                "currentBalanceUsd": balance_usd,
+                "currentBalanceEth": balance_eth,
+            }
+            for risk_level, flags, wallet_type, sanctioned, balance_usd, balance_eth in zip(
+                self.risk_levels, self.risk_flags, self.wallet_types, self.is_sanctioned.tolist(),
+                self.formatted_balances_usd(), self.formatted_balances_eth(),
+            )
+        ]
+
+def score_wallets(combined_wallet_data_list: list) -> BatchRiskScores:
+    return BatchRiskScores(combined_wallet_data_list)
@@ -0,0 +1,79 @@
+# ai-python/benchmarks/bench_imports.py
+#
+# Measures cold import time for each service module, each in a fresh interpreter with
+# `-X importtime`, plus the time the LLM warm-up takes. Run from the repo root:
+#
+#   python -m benchmarks.bench_imports --repeat 5
+#   python -m benchmarks.bench_imports --modules main llm_setup --top 15
+
+import os
+import sys
+import argparse
+import subprocess
+from statistics import median
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICE_MODULES = [
+    "telemetry", "rate_limiter", "response_cache", "api_client", "wallet_records", "data_processor",
+    "report_templates", "prompt_builder", "llm_setup", "report_cache", "llm_service", "transaction_ingest",
+    "nft_metadata", "nft_portfolio", "market_insights", "report_generator", "main",
+]
+
+WARMUP_SNIPPET = "import llm_setup, prompt_builder; llm_setup.get_llm(); prompt_builder.system_message()"
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("BITSCRUNCH_API_KEY", "benchmark")
+    env.setdefault("GROQ_API_KEY", "benchmark")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    return env
+
+def import_profile(code: str) -> dict:
+    """Runs `code` in a fresh interpreter and returns {module: (self_us, cumulative_us)}."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, env=_child_env(), capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+def module_import_ms(module: str, repeat: int) -> float:
+    samples = [import_profile(f"import {module}").get(module, (0, 0))[1] / 1000 for _ in range(repeat)]
+    return median(samples)
+
+def warmup_ms(repeat: int) -> float:
+    code = f"import time; t = time.perf_counter(); {WARMUP_SNIPPET}; print((time.perf_counter() - t) * 1000)"
+    samples = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=_child_env(), capture_output=True, text=True, check=True)
+        samples.append(float(completed.stdout.strip().splitlines()[-1]))
+    return median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module cold import time for the service.")
+    parser.add_argument("--modules", nargs="+", default=SERVICE_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the median is reported.")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest individual imports to list for `main`.")
+    args = parser.parse_args()
+
+    print(f"{'module':>20} {'import ms':>10}")
+    for module in args.modules:
+        print(f"{module:>20} {module_import_ms(module, args.repeat):>10.1f}")
+
+    print(f"\n{'LLM warm-up (lifespan)':>20} {warmup_ms(args.repeat):>10.1f} ms")
+
+    if args.top:
+        profile = import_profile("import main")
+        heaviest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        print("\nHeaviest imports under main (self time):")
+        for name, (self_us, cumulative_us) in heaviest:
+            print(f"{name:>40} {self_us / 1000:>8.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
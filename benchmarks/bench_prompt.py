@@ -0,0 +1,224 @@
+# ai-python/benchmarks/bench_prompt.py
+#
+# Compares the previous prompt builder (kept below as legacy_*) with prompt_builder on synthetic
+# wallets: prompt tokens, build time and how many distinct system prompts are sent. Optionally
+# sends a sample of both prompts to an LLM and compares latency, reported input tokens and
+# whether the report keeps the required sections. Run from the repo root:
+#
+#   python -m benchmarks.bench_prompt --wallets 2000
+#   python -m benchmarks.bench_prompt --llm fake --llm-samples 20
+#   python -m benchmarks.bench_prompt --llm groq --llm-samples 10   # needs GROQ_API_KEY
+
+import os
+import time
+import random
+import asyncio
+import argparse
+from benchmarks.load_test import percentile
+from data_processor import process_and_format_data
+from prompt_builder import build_llm_prompt_messages, estimate_tokens
+from report_templates import REPORT_TITLE, RISK_LINE, SECTION_SUMMARY, SECTION_INSIGHTS, SECTION_VERDICT, DISCLAIMER
+
+def legacy_context_summary(analysis) -> str:
+    m, p, fm = analysis.metrics, analysis.profile, analysis.formatted_metrics
+    yes_no = lambda flag: "Yes" if flag else "No"
+    context_summary = f"""
+- **Core Metrics**:
+  - Wallet Age: {fm['walletAge']}
+  - Balance (USD): {fm['currentBalanceUsd']}
+  - Balance (ETH): {fm['currentBalanceEth']}
+  - Total Transactions: {m.total_txn:,}
+  - Unique Tokens Held: {m.token_cnt:,}
+  - Inflow Addresses: {m.inflow_addresses:,}
+  - Outflow Addresses: {m.outflow_addresses:,}
+
+- **Risk & Profile Analysis**:
+  - Overall Risk Level: {analysis.overall_risk_level}
+  - Is Whale: {yes_no(p.is_whale)}
+  - Is Shark: {yes_no(p.is_shark)}
+  - Is Sanctioned: {yes_no(p.aml_is_sanctioned)}
+  - Sanctioned Volume Exposure: ${m.sanction_volume:,.2f}
+  - Mixer Volume Exposure: ${m.mixer_volume:,.2f}
+  - Illicit Volume Exposure: ${m.illicit_volume:,.2f}
+  - Wash Traded NFT Count: {p.washtrade_nft_count:,}
+"""
+    transaction_summary = analysis.transaction_summary
+    if transaction_summary:
+        top_collections = ", ".join(
+            f"{c['collection_name']} ({c['volume_eth']:,.4f} ETH)" for c in transaction_summary['top_collections_by_volume']
+        ) or "None"
+        context_summary += f"""
+- **NFT Transaction History**:
+  - Transactions Analyzed: {transaction_summary['total_transactions']:,}{"" if transaction_summary['history_complete'] else " (most recent only)"}
+  - Buys / Sells / Other: {transaction_summary['buy_count']:,} / {transaction_summary['sell_count']:,} / {transaction_summary['other_count']:,}
+  - Total Volume: {transaction_summary['total_volume_eth']:,.4f} ETH
+  - Top Collections by Volume: {top_collections}
+  - Active Between: {transaction_summary['first_seen'] or "N/A"} and {transaction_summary['last_seen'] or "N/A"}
+"""
+    return context_summary
+
+def legacy_build_prompt_messages(processed_data, wallet_address: str):
+    from langchain_core.prompts import ChatPromptTemplate
+
+    overall_risk_level = processed_data['overall_risk_level']
+
+    def escape(text: str) -> str:
+        return str(text).replace('{', '{{').replace('}', '}}')
+
+    human_message_content = f"""
+    Analyze the following data summary for wallet address: {wallet_address}
+    --- DATA SUMMARY ---
+    {escape(legacy_context_summary(processed_data))}
+    --- END OF SUMMARY ---
+    Based on all the details in the summary, generate a professional due-diligence report in Markdown format.
+    """
+
+    system_prompt_content = f"""
+    You are CrunchGuardian AI, an expert Web3 analyst. Your goal is to provide a concise, high-level due-diligence report in clean Markdown.
+
+    **CRITICAL RULE: Under no circumstances should you generate code, code snippets, filenames, or programming syntax. Your response must be pure, clean Markdown text.**
+
+    Your report MUST contain ONLY these sections:
+    ### CrunchGuardian AI Report for {wallet_address}
+    **Overall Risk Assessment:** {overall_risk_level}
+    #### Summary
+    [1-2 sentence overview of the wallet's main characteristics.]
+    #### Additional Insights & Red Flags
+    [Elaborate on critical findings from the data summary.]
+    #### Analyst's Verdict
+    [A final, concise expert opinion.]
+    ---
+    **Important Disclaimer:** This report reflects the provided API data and is not investment advice.
+    """
+
+    prompt = ChatPromptTemplate.from_messages([("system", system_prompt_content), ("human", human_message_content)])
+    return prompt.format_messages()
+
+BUILDERS = {"legacy": legacy_build_prompt_messages, "compact": build_llm_prompt_messages}
+
+def synthetic_wallet_data(count: int, seed: int = 7) -> list:
+    """(wallet_address, combined_wallet_data) pairs shaped like report_generator.fetch_wallet_data output."""
+    rng = random.Random(seed)
+    wallets = []
+    for _ in range(count):
+        metrics = {
+            "balance": str(rng.randint(0, 10**22)), "balance_usd": rng.choice([rng.uniform(0, 5000), rng.uniform(5e5, 3e6)]),
+            "in_txn": rng.randint(0, 3000), "out_txn": rng.randint(0, 3000), "total_txn": rng.randint(0, 6000),
+            "token_cnt": rng.randint(0, 800), "inflow_addresses": rng.randint(0, 500), "outflow_addresses": rng.randint(0, 500),
+            "wallet_age": rng.randint(1, 3000),
+            "mixer_volume": rng.choice([0, 0, 0, rng.uniform(0, 1e5)]),
+            "sanction_volume": rng.choice([0] * 9 + [rng.uniform(0, 1e5)]),
+            "illicit_volume": rng.choice([0] * 9 + [rng.uniform(0, 1e5)]),
+        }
+        profile = {
+            "is_shark": rng.random() < 0.15, "is_whale": rng.random() < 0.05, "is_contract": rng.random() < 0.02,
+            "aml_is_sanctioned": rng.random() < 0.02, "washtrade_nft_count": rng.choice([0, 0, 0, rng.randint(1, 40)]),
+        }
+        buys, sells, other = rng.randint(0, 800), rng.randint(0, 800), rng.randint(0, 400)
+        transaction_history = {
+            "total_transactions": buys + sells + other, "buy_count": buys, "sell_count": sells, "other_count": other,
+            "total_volume_eth": round(rng.uniform(0, 5000), 6),
+            "top_collections_by_volume": [
+                {"collection_name": f"Collection {rng.randint(1, 500)}", "volume_eth": round(rng.uniform(0, 500), 6)} for _ in range(5)
+            ],
+            "transactions_by_month": {},
+            "first_seen": "2021-03-04T10:11:12+00:00", "last_seen": "2024-05-06T07:08:09+00:00",
+            "history_complete": rng.random() < 0.7,
+        } if rng.random() < 0.9 else {}
+        wallets.append((
+            f"0x{rng.getrandbits(160):040x}",
+            {"metrics": metrics, "profile": profile, "wallet_nft_transactions": [], "transaction_history": transaction_history},
+        ))
+    return wallets
+
+def make_token_counter(name: str):
+    if name == "tiktoken":
+        import tiktoken  # Optional; cl100k_base is only a proxy for the Llama 3 tokenizer.
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    return estimate_tokens
+
+def _mean(values: list) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+def _p95(values: list) -> float:
+    return percentile(sorted(values), 0.95)
+
+def compare_prompts(analyses: list, count_tokens) -> dict:
+    results = {}
+    for name, builder in BUILDERS.items():
+        started_at = time.perf_counter()
+        prompts = [builder(analysis, wallet_address) for wallet_address, analysis in analyses]
+        build_seconds = time.perf_counter() - started_at
+
+        system_tokens = [count_tokens(messages[0].content) for messages in prompts]
+        human_tokens = [count_tokens(messages[1].content) for messages in prompts]
+        total_tokens = [s + h for s, h in zip(system_tokens, human_tokens)]
+        results[name] = {
+            "system_tokens": _mean(system_tokens), "human_tokens": _mean(human_tokens),
+            "total_tokens": _mean(total_tokens), "total_tokens_p95": _p95(total_tokens),
+            "build_us": build_seconds / len(prompts) * 1e6,
+            "distinct_system_prompts": len({messages[0].content for messages in prompts}),
+        }
+    return results
+
+def structure_score(report: str, wallet_address: str, overall_risk_level: str) -> float:
+    """Share of the required report lines present in an LLM answer."""
+    required = [
+        REPORT_TITLE.format(wallet_address=wallet_address), RISK_LINE.format(overall_risk_level=overall_risk_level),
+        SECTION_SUMMARY, SECTION_INSIGHTS, SECTION_VERDICT, DISCLAIMER,
+    ]
+    return sum(line in report for line in required) / len(required)
+
+async def compare_llm(analyses: list, llm) -> dict:
+    results = {}
+    for name, builder in BUILDERS.items():
+        latencies, input_tokens, scores = [], [], []
+        for wallet_address, analysis in analyses:
+            messages = builder(analysis, wallet_address)
+            started_at = time.perf_counter()
+            response = await llm.ainvoke(messages)
+            latencies.append(time.perf_counter() - started_at)
+            usage = getattr(response, "usage_metadata", None) or {}
+            input_tokens.append(usage.get("input_tokens", 0))
+            scores.append(structure_score(response.content, wallet_address, analysis['overall_risk_level']))
+        results[name] = {
+            "latency_ms": _mean(latencies) * 1000, "latency_p95_ms": _p95(latencies) * 1000,
+            "reported_input_tokens": _mean(input_tokens), "structure_score": _mean(scores),
+        }
+    return results
+
+def _print_table(results: dict):
+    metrics = list(next(iter(results.values())))
+    print(f"{'':>24}" + "".join(f"{name:>12}" for name in results) + f"{'change':>10}")
+    for metric in metrics:
+        legacy, compact = results["legacy"][metric], results["compact"][metric]
+        change = f"{(compact - legacy) / legacy * 100:+.1f}%" if legacy else "n/a"
+        print(f"{metric:>24}" + "".join(f"{results[name][metric]:>12.1f}" for name in results) + f"{change:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy and compact LLM prompt builders.")
+    parser.add_argument("--wallets", type=int, default=2000)
+    parser.add_argument("--tokenizer", choices=["estimate", "tiktoken"], default="estimate")
+    parser.add_argument("--llm", choices=["fake", "groq"], help="Also time report generation with this LLM.")
+    parser.add_argument("--llm-samples", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    analyses = [(address, process_and_format_data(data, address)) for address, data in synthetic_wallet_data(args.wallets, args.seed)]
+    print(f"Prompt size over {len(analyses):,} wallets ({args.tokenizer} tokens):")
+    _print_table(compare_prompts(analyses, make_token_counter(args.tokenizer)))
+
+    if args.llm:
+        if args.llm == "fake":
+            from benchmarks.fake_llm import FakeReportChatModel
+            llm = FakeReportChatModel()
+        else:
+            os.environ.setdefault("LOG_LEVEL", "WARNING")
+            from llm_setup import get_llm
+            llm = get_llm()
+        print(f"\nReport generation with the {args.llm} LLM over {args.llm_samples} wallets:")
+        _print_table(asyncio.run(compare_llm(analyses[:args.llm_samples], llm)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# ai-python/benchmarks/bench_risk_scoring.py
+#
+# Checks the columnar scorer against process_and_format_data on synthetic wallets, then
+# times both. Run from the repo root:  python -m benchmarks.bench_risk_scoring --sizes 10000 100000
+
+import time
+import random
+import argparse
+from data_processor import process_and_format_data
+from batch_scoring import score_wallets
+
+def _maybe(rng: random.Random, value):
+    """Mixes in the shapes the API actually returns: numbers, numeric strings, None, junk."""
+    roll = rng.random()
+    if roll < 0.1:
+        return None
+    if roll < 0.2:
+        return str(value)
+    if roll < 0.22:
+        return "N/A"
+    return value
+
+def synthetic_wallets(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    wallets = []
+    for _ in range(count):
+        metrics = {
+            "balance": _maybe(rng, rng.randint(0, 10**22)),
+            "balance_usd": _maybe(rng, rng.choice([0, rng.uniform(0, 5000), rng.uniform(5e5, 3e6)])),
+            "mixer_volume": _maybe(rng, rng.choice([0, 0, 0, rng.uniform(0, 1e5)])),
+            "sanction_volume": _maybe(rng, rng.choice([0, 0, 0, 0, rng.uniform(0, 1e5)])),
+            "total_txn": rng.randint(0, 5000),
+        }
+        profile = {
+            "is_shark": rng.random() < 0.1,
+            "is_whale": rng.random() < 0.05,
+            "aml_is_sanctioned": rng.random() < 0.02,
+        }
+        for row in (metrics, profile):
+            for key in [k for k in row if rng.random() < 0.05]:
+                del row[key]
+        wallets.append({"metrics": metrics, "profile": profile})
+    return wallets
+
+def scalar_records(wallets: list) -> list:
+    records = []
+    for data in wallets:
+        processed = process_and_format_data(data, "0x0")
+        records.append({
+            "overall_risk_level": processed["overall_risk_level"],
+            "risk_flags": processed["risk_flags"],
+            "summary_points": processed["summary_points"],
+            "currentBalanceUsd": processed["formatted_metrics"]["currentBalanceUsd"],
+            "currentBalanceEth": processed["formatted_metrics"]["currentBalanceEth"],
+        })
+    return records
+
+def check_equivalence(wallets: list):
+    expected = scalar_records(wallets)
+    actual = score_wallets(wallets).to_records()
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            raise AssertionError(f"Wallet {index} differs:\n  scalar:   {want}\n  columnar: {got}\n  input:    {wallets[index]}")
+    print(f"Equivalence OK on {len(wallets):,} wallets.")
+
+def _timed(func, *args) -> float:
+    started_at = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started_at
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs columnar wallet risk scoring.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--check-size", type=int, default=20_000, help="Wallets to compare field by field.")
+    parser.add_argument("--skip-scalar-above", type=int, default=200_000,
+                        help="Only time the columnar path for batches larger than this.")
+    args = parser.parse_args()
+
+    check_equivalence(synthetic_wallets(args.check_size, seed=1))
+
+    print(f"{'wallets':>10} {'scalar s':>10} {'columnar s':>11} {'speedup':>8}")
+    for size in args.sizes:
+        wallets = synthetic_wallets(size)
+        columnar = _timed(lambda: score_wallets(wallets).to_records())
+        if size <= args.skip_scalar_above:
+            scalar = _timed(scalar_records, wallets)
+            print(f"{size:>10,} {scalar:>10.3f} {columnar:>11.3f} {scalar / columnar:>7.1f}x")
+        else:
+            print(f"{size:>10,} {'-':>10} {columnar:>11.3f} {'-':>8}")
+
+if __name__ == "__main__":
+    main()
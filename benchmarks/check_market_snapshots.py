@@ -0,0 +1,113 @@
+# ai-python/benchmarks/check_market_snapshots.py
+#
+# Checks MarketSnapshotStore against an in-process fake client: failed cold refreshes are not
+# cached, failed warm refreshes keep the previous snapshot, and a user request racing the
+# background pass over an evicted pair still gets a payload. Exits non-zero on the first failure.
+# Run from the repo root:  python -m benchmarks.check_market_snapshots
+
+import sys
+import time
+import asyncio
+from fastapi import HTTPException
+from market_insights import MarketSnapshotStore
+
+SECTIONS = ("analytics", "washtrade", "holders", "scores")
+
+class FakeMarketClient:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.failing = False
+        self.calls = 0
+
+    async def _respond(self, blockchain: str, time_range: str):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            raise HTTPException(status_code=503, detail="upstream down")
+        return {"data": [{"blockchain": blockchain, "time_range": time_range}]}
+
+    async def get_market_insights_analytics(self, blockchain, time_range="24h"):
+        return await self._respond(blockchain, time_range)
+
+    async def get_market_insights_washtrade(self, blockchain, time_range="24h"):
+        return await self._respond(blockchain, time_range)
+
+    async def get_market_insights_holders(self, blockchain, time_range="24h"):
+        return await self._respond(blockchain, time_range)
+
+    async def get_market_insights_scores(self, blockchain, time_range="24h"):
+        return await self._respond(blockchain, time_range)
+
+def _has_data(response: dict) -> bool:
+    return all(response[section]["data"] for section in SECTIONS)
+
+async def check_cold_failure_not_cached():
+    client = FakeMarketClient()
+    store = MarketSnapshotStore(client, pairs=[], refresh_interval=300)
+    client.failing = True
+    response = await store.get("ethereum", "24h")
+    assert not any(response[section]["data"] for section in SECTIONS), "a failed refresh should return empty sections"
+    assert not store.snapshots, "an all-failed cold refresh must not be stored"
+
+    client.failing = False
+    response = await store.get("ethereum", "24h")
+    assert _has_data(response), "the first request after recovery should reach the upstream"
+    assert not response["snapshot"]["stale"]
+    print("cold failure OK: empty payload served uncached, next request refetched")
+
+async def check_warm_failure_keeps_previous():
+    client = FakeMarketClient()
+    store = MarketSnapshotStore(client, pairs=[], refresh_interval=300, max_stale=600)
+    await store.get("ethereum", "7d")
+    payload, _ = store.snapshots[("ethereum", "7d")]
+    store.snapshots[("ethereum", "7d")] = (payload, time.time() - 900)  # Past max_stale: forces a foreground refresh.
+
+    client.failing = True
+    response = await store.get("ethereum", "7d")
+    assert _has_data(response), "a failed refresh should fall back to the previous snapshot"
+    assert response["snapshot"]["stale"], "the fallback snapshot should be reported as stale"
+    print("warm failure OK: previous snapshot kept and marked stale")
+
+async def check_request_joins_background_pass():
+    # The background pass lists (24h, 7d) and refreshes 24h slowly. Meanwhile 7d is evicted by a
+    # request for 30d, and a user request waiting on the same 24h refresh then asks for 7d right
+    # as the pass moves on to it.
+    client = FakeMarketClient()
+    slow = {"24h": 0.2}
+    respond = client._respond
+
+    async def delayed(blockchain, time_range):
+        await asyncio.sleep(slow.get(time_range, 0.0))
+        return await respond(blockchain, time_range)
+
+    client._respond = delayed
+    store = MarketSnapshotStore(client, pairs=[], refresh_interval=300, max_pairs=2)
+    await store.get("ethereum", "24h")
+    await store.get("ethereum", "7d")
+
+    store.start()
+    try:
+        await asyncio.sleep(0)  # The pass starts refreshing 24h.
+        await store.get("ethereum", "24h")  # Still fresh: only marks 24h as recently used.
+        await store.get("ethereum", "30d")  # Evicts 7d, the least recently used pair.
+        assert ("ethereum", "7d") not in store.snapshots
+        await store.refresh(("ethereum", "24h"))
+        response = await store.get("ethereum", "7d")
+    finally:
+        await store.stop()
+    assert _has_data(response), "a request for an evicted pair should be refetched, not fail"
+    print("background pass race OK: request for a pair evicted mid-pass was served")
+
+async def run_checks():
+    for check in (check_cold_failure_not_cached, check_warm_failure_keeps_previous, check_request_joins_background_pass):
+        await check()
+
+def main():
+    try:
+        asyncio.run(run_checks())
+    except AssertionError as err:
+        sys.exit(f"FAILED: {err}")
+    print("All market snapshot checks passed.")
+
+if __name__ == "__main__":
+    main()
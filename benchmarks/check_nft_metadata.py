@@ -0,0 +1,62 @@
+# ai-python/benchmarks/check_nft_metadata.py
+#
+# Checks that NFT metadata is cached per NFT against the local fake bitsCrunch server: a later,
+# overlapping request (as from a portfolio page after /batch-nft-metadata) chunked differently
+# only fetches the NFTs not seen before. Exits non-zero on the first failure.
+# Run from the repo root:  python -m benchmarks.check_nft_metadata
+
+import os
+import sys
+import asyncio
+from benchmarks.fake_bitscrunch import FakeBitsCrunchConfig, start_fake_server
+
+os.environ.setdefault("BITSCRUNCH_API_KEY", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from api_client import BitsCrunchAPIClient
+from rate_limiter import RateLimitScheduler
+from response_cache import ResponseCache
+from nft_metadata import fetch_metadata_bulk, iter_metadata_chunks
+
+CONTRACT = "0x" + "ab" * 20
+
+def _pairs(start: int, stop: int) -> list:
+    return [(CONTRACT, str(token_id)) for token_id in range(start, stop)]
+
+async def check_overlapping_requests_reuse_items():
+    config = FakeBitsCrunchConfig(latency=0.01, jitter=0.0)
+    runner, base_url = await start_fake_server(config)
+    os.environ["BITSCRUNCH_BASE_URL"] = base_url
+    client = BitsCrunchAPIClient(scheduler=RateLimitScheduler(rate=100.0, burst=100.0), cache=ResponseCache())
+    try:
+        await client.start()
+        first = await fetch_metadata_bulk(client, _pairs(0, 30))
+        requests_after_first = config.requests
+
+        # Overlaps 20 of the first 30 in a different order, so no 25-item chunk repeats.
+        second = {}
+        async for chunk_result in iter_metadata_chunks(client, list(reversed(_pairs(10, 40)))):
+            second.update(chunk_result)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    assert requests_after_first == 2, f"30 NFTs should take 2 bulk calls, took {requests_after_first}"
+    assert config.requests - requests_after_first == 1, f"only the 10 new NFTs should be fetched, took {config.requests - requests_after_first} calls"
+    assert all(second[f"{CONTRACT}:{t}"] == first[f"{CONTRACT}:{t}"] for t in range(10, 30)), "cached metadata differs from the first fetch"
+    assert not any(value.get("error") for value in second.values()), "some NFTs came back without metadata"
+    print("per-NFT cache OK: overlapping request of 30 NFTs made 1 upstream call instead of 2")
+
+async def run_checks():
+    for check in (check_overlapping_requests_reuse_items,):
+        await check()
+
+def main():
+    try:
+        asyncio.run(run_checks())
+    except AssertionError as err:
+        sys.exit(f"FAILED: {err}")
+    print("All NFT metadata checks passed.")
+
+if __name__ == "__main__":
+    main()
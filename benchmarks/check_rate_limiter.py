@@ -0,0 +1,127 @@
+# ai-python/benchmarks/check_rate_limiter.py
+#
+# Drives BitsCrunchAPIClient + RateLimitScheduler against the local fake bitsCrunch server and
+# checks pacing, Retry-After handling, fail-fast calls on a paused key and the backoff cap.
+# Exits non-zero on the first failure.
+# Run from the repo root:  python -m benchmarks.check_rate_limiter
+
+import os
+import sys
+import time
+import asyncio
+from fastapi import HTTPException
+from benchmarks.fake_bitscrunch import FakeBitsCrunchConfig, start_fake_server
+
+os.environ.setdefault("BITSCRUNCH_API_KEY", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from api_client import BitsCrunchAPIClient
+from rate_limiter import RateLimitScheduler
+from response_cache import ResponseCache
+
+async def _with_client(config: FakeBitsCrunchConfig, scheduler: RateLimitScheduler, scenario):
+    runner, base_url = await start_fake_server(config)
+    os.environ["BITSCRUNCH_BASE_URL"] = base_url
+    # No TTLs, so every call reaches the fake server.
+    client = BitsCrunchAPIClient(scheduler=scheduler, cache=ResponseCache(endpoint_ttls={}))
+    try:
+        await client.start()
+        return await scenario(client)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+def _gaps(times: list) -> list:
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+async def check_pacing():
+    config = FakeBitsCrunchConfig(latency=0.01, jitter=0.0)
+    scheduler = RateLimitScheduler(rate=5.0, burst=1.0, max_concurrency=8)
+    await _with_client(config, scheduler, lambda client: asyncio.gather(
+        *(client.get_wallet_metrics(f"0x{i:040x}") for i in range(11))
+    ))
+    span = config.request_times[-1] - config.request_times[0]
+    assert config.requests == 11, f"expected 11 upstream requests, saw {config.requests}"
+    assert span >= 1.9, f"11 calls at 5 req/s should span about 2s, took {span:.2f}s"
+    assert min(_gaps(config.request_times)) >= 0.15, f"requests closer than the bucket allows: {_gaps(config.request_times)}"
+    print(f"pacing OK: 11 calls at 5 req/s spanned {span:.2f}s")
+
+async def check_retry_after_honored():
+    config = FakeBitsCrunchConfig(latency=0.01, jitter=0.0, throttle_first=1, retry_after=1.5)
+    # backoff_max is far below Retry-After; the full Retry-After must still be waited out.
+    scheduler = RateLimitScheduler(rate=50.0, burst=50.0, backoff_max=0.2, retry_after_max=5.0)
+    result = await _with_client(config, scheduler, lambda client: client.get_wallet_metrics("0x1"))
+    gap = _gaps(config.request_times)[0]
+    assert "data" in result, "throttled call did not succeed after its retry"
+    assert config.requests == 2 and config.throttled == 1, f"expected one 429 then one retry, saw {config.requests} requests"
+    assert gap >= 1.5, f"retried {gap:.2f}s after a 429 with Retry-After: 1.5"
+    print(f"Retry-After OK: retried {gap:.2f}s after a 429 with Retry-After: 1.5")
+
+async def check_retry_after_over_limit():
+    config = FakeBitsCrunchConfig(latency=0.01, jitter=0.0, throttle_first=10, retry_after=60)
+    scheduler = RateLimitScheduler(rate=50.0, burst=50.0, retry_after_max=2.0)
+    started_at = time.monotonic()
+    try:
+        await _with_client(config, scheduler, lambda client: client.get_wallet_metrics("0x1"))
+    except HTTPException as err:
+        assert err.status_code == 429, f"expected the 429 to be re-raised, got {err.status_code}"
+    else:
+        raise AssertionError("a 429 with Retry-After over the limit should be raised")
+    elapsed = time.monotonic() - started_at
+    assert config.requests == 1, f"expected no retry while throttled, saw {config.requests} requests"
+    assert elapsed < 1.0, f"gave up after {elapsed:.2f}s instead of immediately"
+    assert scheduler.bucket_for(os.environ["BITSCRUNCH_API_KEY"]).paused_until > time.monotonic() + 50, "the key should stay paused for the Retry-After window"
+    print(f"Retry-After over limit OK: 429 re-raised after {elapsed:.2f}s with one upstream request")
+
+async def check_paused_key_fails_fast():
+    config = FakeBitsCrunchConfig(latency=0.01, jitter=0.0, throttle_first=10, retry_after=3600)
+    scheduler = RateLimitScheduler(rate=50.0, burst=50.0, retry_after_max=2.0)
+
+    async def scenario(client):
+        try:
+            await client.get_wallet_metrics("0x1")
+        except HTTPException:
+            pass
+        started_at = time.monotonic()
+        try:
+            # A different endpoint on the same key: must not wait out the hour-long pause.
+            await asyncio.wait_for(client.get_wallet_profile("0x1"), timeout=scheduler.retry_after_max + 1)
+        except HTTPException as err:
+            return err, time.monotonic() - started_at
+        raise AssertionError("a call on a key paused past retry_after_max should be rejected")
+
+    err, elapsed = await _with_client(config, scheduler, scenario)
+    assert err.status_code == 429, f"expected a 429 while paused, got {err.status_code}"
+    assert float(err.headers["Retry-After"]) > 3000, f"expected the remaining pause as Retry-After, got {err.headers}"
+    assert config.requests == 1, f"a paused key should not reach the upstream, saw {config.requests} requests"
+    assert elapsed < 0.5, f"second call took {elapsed:.2f}s instead of failing fast"
+    print(f"paused key OK: a later call on another endpoint failed fast in {elapsed:.2f}s with 429")
+
+async def check_backoff_cap():
+    config = FakeBitsCrunchConfig(latency=0.01, jitter=0.0, error_rate=1.0)
+    scheduler = RateLimitScheduler(rate=50.0, burst=50.0, max_retries=3, backoff_base=1.0, backoff_max=0.3)
+    assert all(scheduler.backoff_delay(attempt) <= 0.3 for attempt in range(30) for _ in range(20)), "backoff exceeded backoff_max"
+    try:
+        await _with_client(config, scheduler, lambda client: client.get_wallet_metrics("0x1"))
+    except HTTPException as err:
+        assert err.status_code == 503, f"expected the final 503, got {err.status_code}"
+    else:
+        raise AssertionError("a call failing every attempt should raise")
+    gaps = _gaps(config.request_times)
+    assert config.requests == 4, f"expected 1 attempt + 3 retries, saw {config.requests} requests"
+    assert max(gaps) <= 0.3 + 0.1, f"retry gaps exceed the backoff cap: {gaps}"
+    print(f"backoff cap OK: 4 attempts, largest gap {max(gaps):.2f}s with backoff_max=0.3")
+
+async def run_checks():
+    for check in (check_pacing, check_retry_after_honored, check_retry_after_over_limit, check_paused_key_fails_fast, check_backoff_cap):
+        await check()
+
+def main():
+    try:
+        asyncio.run(run_checks())
+    except AssertionError as err:
+        sys.exit(f"FAILED: {err}")
+    print("All rate limiter checks passed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# ai-python/benchmarks/compare.py
+#
+# Compares two load-test result files:  python -m benchmarks.compare baseline.json candidate.json
+
+import sys
+import json
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps", "errors")
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m benchmarks.compare <baseline.json> <candidate.json>")
+    with open(sys.argv[1]) as f:
+        baseline = json.load(f)
+    with open(sys.argv[2]) as f:
+        candidate = json.load(f)
+
+    print(f"baseline {baseline['commit']}  vs  candidate {candidate['commit']}")
+    for endpoint in sorted(set(baseline["results"]) | set(candidate["results"])):
+        old = baseline["results"].get(endpoint)
+        new = candidate["results"].get(endpoint)
+        if old is None or new is None:
+            print(f"\n{endpoint}: only in {'candidate' if old is None else 'baseline'}")
+            continue
+        print(f"\n{endpoint}")
+        for metric in METRICS:
+            print(f"  {metric:>8}: {old[metric]:>10} -> {new[metric]:>10}  ({_change(old[metric], new[metric])})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# ai-python/benchmarks/fake_bitscrunch.py
+#
+# Local stand-in for the bitsCrunch v2 API with configurable latency, errors and throttling.
+# Standalone:  python -m benchmarks.fake_bitscrunch --port 8900 --latency 0.08 --throttle-rate 0.02
+
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from aiohttp import web
+
+class FakeBitsCrunchConfig:
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 0.5, seed: int = 7, throttle_first: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.throttle_first = throttle_first  # The first N requests are always throttled.
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.request_times = []
+
+def _wallet_rng(*parts) -> random.Random:
+    """Same wallet, same data: responses are derived from a hash of the request."""
+    digest = hashlib.sha256("|".join(str(p).lower() for p in parts).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+def _page_params(request: web.Request, default_limit: int = 10):
+    return int(request.query.get("offset", 0)), int(request.query.get("limit", default_limit))
+
+def wallet_metrics(request: web.Request) -> dict:
+    rng = _wallet_rng("metrics", request.query.get("wallet"))
+    return {"data": [{
+        "balance": str(rng.randint(0, 5 * 10**20)),
+        "balance_usd": rng.choice([rng.uniform(0, 5000), rng.uniform(5e5, 2e6)]),
+        "in_txn": rng.randint(0, 2000), "out_txn": rng.randint(0, 2000), "total_txn": rng.randint(0, 4000),
+        "token_cnt": rng.randint(0, 500), "inflow_addresses": rng.randint(0, 300), "outflow_addresses": rng.randint(0, 300),
+        "wallet_age": rng.randint(1, 2500),
+        "mixer_volume": rng.choice([0, 0, 0, rng.uniform(0, 1e4)]),
+        "sanction_volume": rng.choice([0] * 9 + [rng.uniform(0, 1e4)]),
+        "illicit_volume": rng.choice([0] * 9 + [rng.uniform(0, 1e4)]),
+    }]}
+
+def wallet_profile(request: web.Request) -> dict:
+    rng = _wallet_rng("profile", request.query.get("wallet"))
+    return {"data": [{
+        "is_shark": rng.random() < 0.15, "is_whale": rng.random() < 0.05, "is_contract": rng.random() < 0.02,
+        "aml_is_sanctioned": rng.random() < 0.01, "washtrade_nft_count": rng.choice([0, 0, 0, rng.randint(1, 20)]),
+    }]}
+
+def nft_transactions(request: web.Request) -> dict:
+    wallet = request.query.get("wallet_address")
+    total = _wallet_rng("tx-count", wallet).randint(0, 600)
+    offset, limit = _page_params(request)
+    data = []
+    for index in range(offset, min(offset + limit, total)):
+        rng = _wallet_rng("tx", wallet, index)
+        data.append({
+            "transaction_hash": f"0x{rng.getrandbits(128):032x}",
+            "timestamp": 1_700_000_000 - index * 3600,
+            "transaction_type": rng.choice(["buy", "sell", "mint", "transfer"]),
+            "collection_name": f"Collection {rng.randint(1, 40)}",
+            "contract_address": f"0x{rng.getrandbits(160):040x}",
+            "price_eth": round(rng.uniform(0, 3), 4),
+        })
+    return {"data": data, "pagination": {"offset": offset, "limit": limit, "total_items": total}}
+
+def wallet_nft_balance(request: web.Request) -> dict:
+    wallet = request.query.get("wallet")
+    total = _wallet_rng("balance-count", wallet).randint(0, 400)
+    offset, limit = _page_params(request, 100)
+    data = [
+        {"contract_address": f"0x{_wallet_rng('contract', wallet, i % 25).getrandbits(160):040x}", "token_id": str(i), "quantity": 1}
+        for i in range(offset, min(offset + limit, total))
+    ]
+    return {"data": data, "pagination": {"offset": offset, "limit": limit, "total_items": total}}
+
+def nft_metadata(request: web.Request) -> dict:
+    contracts = request.query.getall("contract_address", [])
+    token_ids = request.query.getall("token_id", [])
+    return {"data": [
+        {"contract_address": contract, "token_id": token_id, "name": f"Token #{token_id}",
+         "image_url": f"https://example.invalid/{contract}/{token_id}.png"}
+        for contract, token_id in zip(contracts, token_ids)
+    ]}
+
+def market_insights(request: web.Request) -> dict:
+    rng = _wallet_rng("market", request.path, request.query.get("blockchain"), request.query.get("time_range"))
+    return {"data": [{"value": rng.uniform(0, 1e6), "change": rng.uniform(-1, 1)} for _ in range(24)]}
+
+ROUTES = {
+    "/wallet/metrics": wallet_metrics,
+    "/nft/wallet/profile": wallet_profile,
+    "/nft/transactions": nft_transactions,
+    "/wallet/balance/nft": wallet_nft_balance,
+    "/nft/metadata": nft_metadata,
+    "/nft/market-insights/analytics": market_insights,
+    "/nft/market-insights/washtrade": market_insights,
+    "/nft/market-insights/holders": market_insights,
+    "/nft/market-insights/scores": market_insights,
+}
+
+def create_app(config: FakeBitsCrunchConfig, prefix: str = "/api/v2") -> web.Application:
+    async def handle(request: web.Request):
+        config.requests += 1
+        config.request_times.append(time.monotonic())
+        await asyncio.sleep(max(0.0, config.latency + config.random.uniform(-config.jitter, config.jitter)))
+        if config.requests <= config.throttle_first or config.random.random() < config.throttle_rate:
+            config.throttled += 1
+            return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": str(config.retry_after)})
+        if config.random.random() < config.error_rate:
+            config.errors += 1
+            return web.Response(status=503, text="Service Unavailable")
+        route = ROUTES.get(request.path[len(prefix):])
+        if route is None:
+            return web.Response(status=404, text="Not Found")
+        return web.json_response(route(request))
+
+    app = web.Application()
+    app.router.add_get(prefix + "/{tail:.*}", handle)
+    return app
+
+async def start_fake_server(config: FakeBitsCrunchConfig, host: str = "127.0.0.1", port: int = 0):
+    """Starts the server in the running loop; returns (runner, base_url). Port 0 picks a free port."""
+    runner = web.AppRunner(create_app(config))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}/api/v2"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake bitsCrunch API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = FakeBitsCrunchConfig(args.latency, args.jitter, args.error_rate, args.throttle_rate)
+    print(f"Fake bitsCrunch API on http://{args.host}:{args.port}/api/v2 (set BITSCRUNCH_BASE_URL to this)")
+    web.run_app(create_app(config), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
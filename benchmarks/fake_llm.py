@@ -0,0 +1,68 @@
+# ai-python/benchmarks/fake_llm.py
+#
+# A chat model that answers like the report LLM without calling Groq, with configurable
+# time-to-first-token and token rate. Install it with `install_fake_llm()` before serving requests.
+
+import time
+import asyncio
+from typing import Any, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+FAKE_REPORT_BODY = (
+    "#### Summary\n"
+    "The wallet shows steady NFT trading activity with moderate balances.\n"
+    "#### Additional Insights & Red Flags\n"
+    "- No direct sanctions exposure was found in the provided data.\n"
+    "#### Analyst's Verdict\n"
+    "Standard due diligence is appropriate.\n"
+    "---\n"
+    "**Important Disclaimer:** This report reflects the provided API data and is not investment advice."
+)
+
+class FakeReportChatModel(BaseChatModel):
+    first_token_latency: float = 0.3
+    tokens_per_second: float = 400.0
+    response: str = FAKE_REPORT_BODY
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-report-chat-model"
+
+    def _tokens(self) -> list:
+        words = self.response.split(" ")
+        return [word + (" " if i < len(words) - 1 else "") for i, word in enumerate(words)]
+
+    def _usage(self, messages: List[BaseMessage]) -> dict:
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4
+        output_tokens = len(self._tokens())
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def _total_latency(self) -> float:
+        return self.first_token_latency + len(self._tokens()) / self.tokens_per_second
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._total_latency())
+        message = AIMessage(content=self.response, usage_metadata=self._usage(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._total_latency())
+        message = AIMessage(content=self.response, usage_metadata=self._usage(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any):
+        await asyncio.sleep(self.first_token_latency)
+        tokens = self._tokens()
+        for index, token in enumerate(tokens):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            usage = self._usage(messages) if index == len(tokens) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+
+def install_fake_llm(model: BaseChatModel = None) -> BaseChatModel:
+    """Swaps the service's LLM for `model` (a FakeReportChatModel by default)."""
+    import llm_setup
+    model = model or FakeReportChatModel()
+    llm_setup.set_llm(model)
+    return model
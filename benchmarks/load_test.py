@@ -0,0 +1,195 @@
+# ai-python/benchmarks/load_test.py
+#
+# Offline load test: runs the FastAPI app in-process against the fake bitsCrunch server and the
+# fake LLM, drives each endpoint with concurrent requests, and reports p50/p95/p99 and req/s.
+#
+#   python -m benchmarks.load_test --requests 200 --concurrency 20
+#   python -m benchmarks.load_test --target http://localhost:8000   # an already running server
+#
+# Caches stay on by default, so wallets repeated from --wallet-pool are served from the report
+# cache without calling the LLM; pass --no-cache to measure the uncached path.
+#
+# Results are written as JSON (default benchmarks/results/<commit>.json); compare two runs with
+#   python -m benchmarks.compare old.json new.json
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+import httpx
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # Rounded first so float noise (e.g. 0.07 * 100 = 7.000000000000001) doesn't bump the rank.
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    index = max(0, min(len(sorted_values) - 1, rank - 1))
+    return sorted_values[index]
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def build_scenarios(wallet_pool: int, rng: random.Random, no_cache: bool = False) -> dict:
+    wallets = [f"0x{rng.getrandbits(160):040x}" for _ in range(wallet_pool)]
+    contracts = [f"0x{rng.getrandbits(160):040x}" for _ in range(10)]
+
+    return {
+        # With no_cache, refresh makes every report call the (fake) LLM instead of the report cache.
+        "generate-report": lambda: ("/generate-report", {"address": rng.choice(wallets), "report_mode": "llm", "refresh": no_cache}),
+        "market-insights": lambda: ("/market-insights", {"blockchain": "ethereum", "time_range": rng.choice(["24h", "7d", "30d"])}),
+        "batch-nft-metadata": lambda: ("/batch-nft-metadata", {
+            "nfts": [{"contract_address": rng.choice(contracts), "token_id": str(rng.randint(1, 5000))} for _ in range(20)]
+        }),
+        "nft-portfolio": lambda: ("/nft-portfolio", {"address": rng.choice(wallets), "include_metadata": True}),
+    }
+
+async def run_scenario(client: httpx.AsyncClient, make_request, total: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(make_request())
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                path, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started_at = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+    }
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0):
+    """Polls /ready so warm-up time is not counted against the first requests."""
+    deadline = time.monotonic() + timeout
+    while (await client.get("/ready")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError("The service did not become ready in time.")
+        await asyncio.sleep(0.05)
+
+async def run_all(args, client: httpx.AsyncClient) -> dict:
+    rng = random.Random(args.seed)
+    scenarios = build_scenarios(args.wallet_pool, rng, args.no_cache)
+    selected = args.endpoints or list(scenarios)
+    results = {}
+    for name in selected:
+        results[name] = await run_scenario(client, scenarios[name], args.requests, args.concurrency)
+        print(f"{name:>20}: {results[name]}")
+    return results
+
+async def run_in_process(args) -> dict:
+    from benchmarks.fake_bitscrunch import FakeBitsCrunchConfig, start_fake_server
+
+    fake_config = FakeBitsCrunchConfig(args.upstream_latency, args.upstream_jitter, args.error_rate, args.throttle_rate, seed=args.seed)
+    runner, base_url = await start_fake_server(fake_config)
+
+    # The service reads these when its modules are imported, so they are set first.
+    state_dir = tempfile.mkdtemp(prefix="crunchguardian-bench-")
+    os.environ["BITSCRUNCH_BASE_URL"] = base_url
+    os.environ.setdefault("BITSCRUNCH_API_KEY", "benchmark")
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    os.environ["BITSCRUNCH_RATE_PER_SEC"] = str(args.upstream_rate)
+    os.environ["BITSCRUNCH_RATE_BURST"] = str(args.upstream_rate)
+    os.environ["REPORT_CACHE_PATH"] = os.path.join(state_dir, "report_cache.sqlite3")
+    os.environ["TRANSACTION_CHECKPOINT_PATH"] = os.path.join(state_dir, "transaction_checkpoints.sqlite3")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from benchmarks.fake_llm import FakeReportChatModel, install_fake_llm
+    import main
+
+    install_fake_llm(FakeReportChatModel(first_token_latency=args.llm_latency, tokens_per_second=args.llm_tokens_per_second))
+    if args.no_cache:
+        from response_cache import shared_response_cache
+        shared_response_cache.endpoint_ttls.clear()
+
+    try:
+        async with main.app.router.lifespan_context(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+                await wait_until_ready(client)
+                results = await run_all(args, client)
+    finally:
+        await runner.cleanup()
+
+    print(f"Fake upstream: {fake_config.requests} requests, {fake_config.throttled} throttled, {fake_config.errors} errors")
+    return results
+
+async def run_against_target(args) -> dict:
+    async with httpx.AsyncClient(base_url=args.target, timeout=args.timeout) as client:
+        await wait_until_ready(client)
+        return await run_all(args, client)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the CrunchGuardian API.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--endpoints", nargs="+", choices=["generate-report", "market-insights", "batch-nft-metadata", "nft-portfolio"])
+    parser.add_argument("--wallet-pool", type=int, default=50, help="Distinct wallets used by /generate-report.")
+    parser.add_argument("--upstream-latency", type=float, default=0.05)
+    parser.add_argument("--upstream-jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--upstream-rate", type=float, default=50.0, help="Client token-bucket rate (req/s).")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Fake LLM time to first token (s).")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the bitsCrunch response cache and bypass the report cache.")
+    parser.add_argument("--target", help="Base URL of a running server; skips the in-process app and fakes.")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/<commit>.json).")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_against_target(args) if args.target else run_in_process(args))
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "config": config,
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,89 @@
 # ai-python/llm_service.py
 
+import asyncio
 from fastapi import HTTPException
-from llm_setup import llm
+from llm_setup import get_llm, llm_loaded, MODEL_NAME
 from prompt_builder import build_llm_prompt_messages
+from report_cache import report_cache, report_cache_key
+from telemetry import get_logger, LLM_LATENCY, LLM_TOKENS, REPORT_CACHE_LOOKUPS
 
-async def invoke_llm_chain(processed_data: dict, wallet_address: str):
+logger = get_logger(__name__)
+
+def _record_token_usage(usage_metadata):
+    if usage_metadata:
+        LLM_TOKENS.inc(usage_metadata.get("input_tokens", 0), kind="input")
+        LLM_TOKENS.inc(usage_metadata.get("output_tokens", 0), kind="output")
+
+async def _build_prompt(processed_data: dict, wallet_address: str):
+    """
+    Builds the prompt messages. Until the LLM is loaded, the LangChain import it needs runs in a
+    worker thread (joining the startup warm-up if it's in progress), so the event loop never
+    blocks on it.
+    """
+    if not llm_loaded():
+        await asyncio.to_thread(get_llm)
+    return build_llm_prompt_messages(processed_data, wallet_address)
+
+async def invoke_llm_chain(processed_data: dict, wallet_address: str, refresh: bool = False):
     """
-    Builds the prompt and invokes the LLM.
+    Builds the prompt and invokes the LLM, reusing a stored report for an identical prompt
+    unless `refresh` is set.
     """
     try:
-        prompt_messages = build_llm_prompt_messages(processed_data, wallet_address)
-        print("Invoking LLM with constructed prompt...")
+        prompt_messages = await _build_prompt(processed_data, wallet_address)
+        cache_key = report_cache_key(MODEL_NAME, prompt_messages)
+
+        if not refresh:
+            cached_report = await report_cache.get(cache_key)
+            if cached_report is not None:
+                REPORT_CACHE_LOOKUPS.inc(result="hit")
+                logger.info("Serving AI report from the report cache.")
+                return cached_report
+            REPORT_CACHE_LOOKUPS.inc(result="miss")
+
+        logger.info("Invoking LLM with constructed prompt...")
         
-        llm_response = await llm.ainvoke(prompt_messages)
+        with LLM_LATENCY.time(mode="invoke"):
+            llm_response = await get_llm().ainvoke(prompt_messages)
+        _record_token_usage(getattr(llm_response, "usage_metadata", None))
+        await report_cache.put(cache_key, llm_response.content)
         
         # Directly return the clean content from the AI
         return llm_response.content
         
     except Exception as err:
-        print(f"[LLM Service Error] Failed to invoke LLM: {err}")
+        logger.error("Failed to invoke LLM: %s", err)
+        raise HTTPException(status_code=500, detail=f"Failed to generate AI report: {str(err)}.")
+
+async def stream_llm_chain(processed_data: dict, wallet_address: str, refresh: bool = False):
+    """
+    Same as `invoke_llm_chain`, but yields the report as text chunks while the LLM produces them.
+    A stored report is yielded as a single chunk.
+    """
+    try:
+        prompt_messages = await _build_prompt(processed_data, wallet_address)
+        cache_key = report_cache_key(MODEL_NAME, prompt_messages)
+
+        if not refresh:
+            cached_report = await report_cache.get(cache_key)
+            if cached_report is not None:
+                REPORT_CACHE_LOOKUPS.inc(result="hit")
+                logger.info("Serving AI report from the report cache.")
+                yield cached_report
+                return
+            REPORT_CACHE_LOOKUPS.inc(result="miss")
+
+        logger.info("Streaming LLM response for constructed prompt...")
+        chunks = []
+        with LLM_LATENCY.time(mode="stream"):
+            async for chunk in get_llm().astream(prompt_messages):
+                _record_token_usage(getattr(chunk, "usage_metadata", None))
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+
+        await report_cache.put(cache_key, "".join(chunks))
+
+    except Exception as err:
+        logger.error("Failed to stream LLM: %s", err)
         raise HTTPException(status_code=500, detail=f"Failed to generate AI report: {str(err)}.")
\ No newline at end of file
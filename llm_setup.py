@@ -1,12 +1,38 @@
 # ai-python/llm_setup.py
 import os
-from langchain_groq import ChatGroq
+import threading
+from telemetry import get_logger
 
-# This tells the application to use the blazing-fast Groq cloud service.
-llm = ChatGroq(
-    temperature=0,
-    model_name="llama3-8b-8192",
-    groq_api_key=os.getenv("GROQ_API_KEY")
-)
+MODEL_NAME = "llama3-8b-8192"
 
-print("LLM Service is now using Groq with model 'llama3-8b-8192'.")
\ No newline at end of file
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm():
+    """
+    Returns the shared chat model, creating it on first use. LangChain and the Groq client
+    are only imported here, so importing the service stays cheap.
+    """
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                from langchain_groq import ChatGroq
+
+                # This tells the application to use the blazing-fast Groq cloud service.
+                _llm = ChatGroq(
+                    temperature=0,
+                    model_name=MODEL_NAME,
+                    groq_api_key=os.getenv("GROQ_API_KEY")
+                )
+                get_logger(__name__).info("LLM Service is now using Groq with model '%s'.", MODEL_NAME)
+    return _llm
+
+def llm_loaded() -> bool:
+    """True once the shared chat model exists, i.e. `get_llm()` returns without importing anything."""
+    return _llm is not None
+
+def set_llm(model):
+    """Replaces the shared chat model, e.g. with a fake one for benchmarks."""
+    global _llm
+    _llm = model
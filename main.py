@@ -1,15 +1,71 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Literal
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, Response
+from contextlib import asynccontextmanager
 import asyncio
-from report_generator import generate_comprehensive_report
-from api_client import BitsCrunchAPIClient
+import orjson
+from report_generator import (
+    generate_comprehensive_report, stream_comprehensive_report, generate_batch_reports,
+    get_bits_crunch_client, MAX_BATCH_ADDRESSES
+)
+from llm_setup import get_llm
+from prompt_builder import system_message
+from report_cache import report_cache
+from response_cache import shared_response_cache
+from transaction_ingest import checkpoint_store, stop_ingest_tasks
+from telemetry import register_callback, render_prometheus, get_logger
+from nft_metadata import iter_metadata_chunks, fetch_metadata_bulk
+from nft_portfolio import fetch_portfolio_page, iter_portfolio
+from market_insights import MarketSnapshotStore
 
 # --- Setup ---
 load_dotenv()
-app = FastAPI()
+
+logger = get_logger(__name__)
+
+async def warm_up(app: FastAPI):
+    """Loads the LLM stack off the event loop; /ready reports 503 until this finishes."""
+    try:
+        await asyncio.to_thread(get_llm)
+        await asyncio.to_thread(system_message)
+        app.state.ready = True
+        logger.info("Warm-up finished; ready for traffic.")
+    except Exception as e:
+        app.state.warmup_error = str(e)
+        logger.error("Warm-up failed: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warmup_error = None
+    # One pooled keep-alive session shared by every endpoint for the app's lifetime.
+    client = get_bits_crunch_client()
+    await client.start()
+    app.state.market_snapshots = MarketSnapshotStore.from_env(client)
+    app.state.market_snapshots.start()
+    warmup_task = asyncio.ensure_future(warm_up(app))
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        await app.state.market_snapshots.stop()
+        await stop_ingest_tasks()
+        await client.close()
+        report_cache.close()
+        checkpoint_store.close()
+
+app = FastAPI(lifespan=lifespan)
+
+def _response_cache_lookups():
+    stats = shared_response_cache.stats()
+    return {(("result", "hit"),): stats["hits"], (("result", "miss"),): stats["misses"], (("result", "coalesced"),): stats["coalesced"]}
+
+register_callback("bitscrunch_cache_lookups_total", "bitsCrunch response cache lookups by result.", "counter", _response_cache_lookups)
+register_callback("bitscrunch_cache_bytes", "Approximate bytes held by the bitsCrunch response cache.", "gauge",
+                  lambda: {(): shared_response_cache.stats()["bytes"]})
 
 def read_root():
     return {"message": "Backend is working!"}
@@ -36,13 +92,23 @@ class NftIdentifier(BaseModel):
 class BatchMetadataRequest(BaseModel):
     nfts: List[NftIdentifier]
     blockchain: str = "ethereum"
+    stream: bool = False
 
 class PortfolioRequest(BaseModel):
     address: str
     blockchain: str = "ethereum"
+    include_metadata: bool = False
+    stream: bool = False
 
 class AnalysisRequest(BaseModel):
     address: str
+    refresh: bool = False
+    report_mode: Literal["auto", "llm", "template"] = "auto"
+
+class BatchAnalysisRequest(BaseModel):
+    addresses: List[str]
+    refresh: bool = False
+    report_mode: Literal["auto", "llm", "template"] = "auto"
 
 class MarketRequest(BaseModel):
     blockchain: str = "ethereum"
@@ -52,25 +118,25 @@ class MarketRequest(BaseModel):
 async def read_root():
     return {"message": "CrunchGuardian AI Backend is running"}
 
+@app.get("/ready")
+async def get_readiness():
+    if not getattr(app.state, "ready", False):
+        detail = app.state.warmup_error if getattr(app.state, "warmup_error", None) else "Warming up."
+        raise HTTPException(status_code=503, detail=detail)
+    return {"status": "ready"}
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache-stats")
+async def get_cache_stats():
+    return shared_response_cache.stats()
+
 @app.post("/market-insights")
 async def get_market_insights_endpoint(request: MarketRequest):
-    client = BitsCrunchAPIClient()
     try:
-        tasks = {
-            "analytics": client.get_market_insights_analytics(request.blockchain, time_range=request.time_range),
-            "washtrade": client.get_market_insights_washtrade(request.blockchain, time_range=request.time_range),
-            "holders": client.get_market_insights_holders(request.blockchain, time_range=request.time_range),
-            "scores": client.get_market_insights_scores(request.blockchain, time_range=request.time_range)
-        }
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
-        
-        response_payload = {}
-        for key, result in dict(zip(tasks.keys(), results)).items():
-            if not isinstance(result, Exception) and isinstance(result, dict) and "data" in result:
-                response_payload[key] = {"data": result.get("data", [])}
-            else:
-                response_payload[key] = {"data": []}
-        return response_payload
+        return await app.state.market_snapshots.get(request.blockchain, request.time_range)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -78,10 +144,22 @@ async def get_market_insights_endpoint(request: MarketRequest):
 
 @app.post("/nft-portfolio")
 async def get_nft_portfolio(request: PortfolioRequest):
-    client = BitsCrunchAPIClient()
+    client = get_bits_crunch_client()
     try:
-        portfolio_response = await client.get_wallet_nft_balance(request.address, blockchain=request.blockchain, limit=100)
-        return portfolio_response.get("data", [])
+        # The first page is fetched up front so upstream errors still map to an HTTP status.
+        first_page = await fetch_portfolio_page(client, request.address, request.blockchain, 0)
+        holdings = iter_portfolio(client, request.address, request.blockchain, first_page, request.include_metadata)
+
+        if request.stream:
+            async def ndjson_lines():
+                try:
+                    async for item in holdings:
+                        yield orjson.dumps(item) + b"\n"
+                except Exception as e:
+                    yield orjson.dumps({"error": f"Failed to fetch NFT portfolio list: {getattr(e, 'detail', e)}"}) + b"\n"
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+        return [item async for item in holdings]
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -89,31 +167,44 @@ async def get_nft_portfolio(request: PortfolioRequest):
 
 @app.post("/batch-nft-metadata")
 async def get_batch_nft_metadata(request: BatchMetadataRequest):
-    client = BitsCrunchAPIClient()
-    enriched_nfts: Dict[str, dict] = {}
-    
-    for nft in request.nfts:
-        try:
-            print(f"Fetching metadata for {nft.token_id}...")
-            metadata_response = await client.get_nft_metadata(nft.contract_address, nft.token_id, blockchain=request.blockchain)
-            
-            identifier = f"{nft.contract_address}:{nft.token_id}"
-            if metadata_response and metadata_response.get("data"):
-                enriched_nfts[identifier] = metadata_response["data"][0]
-            else:
-                enriched_nfts[identifier] = {"error": True}
-            await asyncio.sleep(0.35)
-        except Exception as e:
-            print(f"Could not fetch metadata for {nft.token_id}: {e}")
-            enriched_nfts[f"{nft.contract_address}:{nft.token_id}"] = {"error": True}
-            continue
-            
-    return enriched_nfts
+    client = get_bits_crunch_client()
+    nfts = [(nft.contract_address, nft.token_id) for nft in request.nfts]
+
+    if request.stream:
+        async def ndjson_lines():
+            async for chunk_result in iter_metadata_chunks(client, nfts, request.blockchain):
+                for identifier, metadata in chunk_result.items():
+                    yield orjson.dumps({"id": identifier, "metadata": metadata}) + b"\n"
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    return await fetch_metadata_bulk(client, nfts, request.blockchain)
 
 @app.post("/generate-report")
 async def generate_report(request: AnalysisRequest):
     try:
-        report_data = await generate_comprehensive_report(request.address)
-        return report_data
+        report_data = await generate_comprehensive_report(request.address, refresh=request.refresh, report_mode=request.report_mode)
+        # orjson serializes the slotted transaction records directly, skipping FastAPI's encoder pass.
+        return Response(orjson.dumps(report_data), media_type="application/json")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/generate-report/stream")
+async def generate_report_stream(request: AnalysisRequest):
+    async def sse_events():
+        async for event, data in stream_comprehensive_report(request.address, refresh=request.refresh, report_mode=request.report_mode):
+            yield b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/batch-generate-report")
+async def batch_generate_report(request: BatchAnalysisRequest):
+    if len(request.addresses) > MAX_BATCH_ADDRESSES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ADDRESSES} addresses can be screened per batch.")
+
+    async def ndjson_lines():
+        async for result in generate_batch_reports(request.addresses, refresh=request.refresh, report_mode=request.report_mode):
+            yield orjson.dumps(result) + b"\n"
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
\ No newline at end of file
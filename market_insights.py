@@ -0,0 +1,145 @@
+# ai-python/market_insights.py
+
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timezone
+from telemetry import get_logger
+
+logger = get_logger(__name__)
+
+def _configured_pairs() -> list:
+    pairs = []
+    for item in os.getenv("MARKET_SNAPSHOT_PAIRS", "ethereum:24h,ethereum:7d").split(","):
+        if ":" in item:
+            blockchain, time_range = item.strip().split(":", 1)
+            pairs.append((blockchain, time_range))
+    return pairs
+
+async def fetch_market_insights(client, blockchain: str, time_range: str):
+    """
+    Fetches the four market insight payloads concurrently. Returns the response payload
+    and how many of the four calls failed (a failed section is returned as empty data).
+    """
+    tasks = {
+        "analytics": client.get_market_insights_analytics(blockchain, time_range=time_range),
+        "washtrade": client.get_market_insights_washtrade(blockchain, time_range=time_range),
+        "holders": client.get_market_insights_holders(blockchain, time_range=time_range),
+        "scores": client.get_market_insights_scores(blockchain, time_range=time_range)
+    }
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    response_payload, failures = {}, 0
+    for key, result in dict(zip(tasks.keys(), results)).items():
+        if not isinstance(result, Exception) and isinstance(result, dict) and "data" in result:
+            response_payload[key] = {"data": result.get("data", [])}
+        else:
+            failures += 1
+            response_payload[key] = {"data": []}
+    return response_payload, failures
+
+class MarketSnapshotStore:
+    """
+    Keeps a precomputed market insights payload per (blockchain, time_range), refreshed in the
+    background. Stale snapshots are served immediately while a refresh runs; only a missing
+    or very old snapshot makes the caller wait. At most `max_pairs` pairs are tracked.
+    """
+
+    def __init__(self, client, pairs: list = None, refresh_interval: float = 300, max_stale: float = 3600, max_pairs: int = 32):
+        self.client = client
+        self.pairs = list(pairs if pairs is not None else _configured_pairs())
+        self.refresh_interval = refresh_interval
+        self.max_stale = max_stale
+        self.max_pairs = max(max_pairs, len(self.pairs))
+        self.snapshots = OrderedDict()  # (blockchain, time_range) -> (payload, fetched_at)
+        self.refreshing = {}
+        self._task = None
+
+    @classmethod
+    def from_env(cls, client):
+        return cls(
+            client,
+            refresh_interval=float(os.getenv("MARKET_SNAPSHOT_REFRESH_SECONDS", "300")),
+            max_stale=float(os.getenv("MARKET_SNAPSHOT_MAX_STALE_SECONDS", "3600")),
+            max_pairs=int(os.getenv("MARKET_SNAPSHOT_MAX_PAIRS", "32")),
+        )
+
+    async def _refresh_now(self, key: tuple):
+        payload, failures = await fetch_market_insights(self.client, *key)
+        if failures == len(payload):
+            previous = self.snapshots.get(key)
+            if previous is not None:
+                logger.warning("Market insights refresh failed for %s; keeping the previous snapshot.", key)
+                return previous
+            # Nothing to fall back on: serve the empty sections uncached, so the next request retries upstream.
+            logger.warning("Market insights refresh failed for %s; nothing cached.", key)
+            return payload, time.time()
+        snapshot = self.snapshots[key] = (payload, time.time())
+        self.snapshots.move_to_end(key)
+        while len(self.snapshots) > self.max_pairs:
+            # Evict the least recently requested pair that is not configured for background refresh.
+            evictable = next((k for k in self.snapshots if k not in self.pairs), None)
+            if evictable is None:
+                break
+            del self.snapshots[evictable]
+        return snapshot
+
+    def refresh(self, key: tuple) -> asyncio.Task:
+        """Starts (or joins) the refresh for `key`; concurrent callers share one task."""
+        task = self.refreshing.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh_now(key))
+            self.refreshing[key] = task
+            task.add_done_callback(lambda _: self.refreshing.pop(key, None))
+        return task
+
+    async def get(self, blockchain: str, time_range: str) -> dict:
+        key = (blockchain, time_range)
+        snapshot = self.snapshots.get(key)
+        age = time.time() - snapshot[1] if snapshot else None
+
+        if snapshot is None or age > self.max_stale:
+            snapshot = await asyncio.shield(self.refresh(key))
+            age = time.time() - snapshot[1]
+        elif age > self.refresh_interval:
+            self.refresh(key)
+        if key in self.snapshots:
+            self.snapshots.move_to_end(key)
+
+        payload, fetched_at = snapshot
+        return {
+            **payload,
+            "snapshot": {
+                "fetched_at": datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat(),
+                "age_seconds": round(age, 1),
+                "stale": age > self.refresh_interval,
+            },
+        }
+
+    async def _run(self):
+        while True:
+            # One pair at a time, so a background pass never bursts against the upstream quota.
+            for key in list(dict.fromkeys(self.pairs + list(self.snapshots))):
+                if key not in self.snapshots and key not in self.pairs:
+                    continue  # Evicted while earlier pairs were refreshing; don't bring it back.
+                try:
+                    await self.refresh(key)
+                except Exception as e:
+                    logger.error("Background market insights refresh failed for %s: %s", key, e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self.refreshing.values()):
+            task.cancel()
@@ -0,0 +1,90 @@
+# ai-python/nft_metadata.py
+
+import os
+import asyncio
+from telemetry import get_logger
+
+logger = get_logger(__name__)
+
+METADATA_CHUNK_SIZE = int(os.getenv("NFT_METADATA_CHUNK_SIZE", "25"))
+METADATA_CHUNK_CONCURRENCY = int(os.getenv("NFT_METADATA_CHUNK_CONCURRENCY", "4"))
+METADATA_ENDPOINT = "/nft/metadata"
+
+def nft_identifier(contract_address: str, token_id) -> str:
+    return f"{contract_address}:{token_id}"
+
+def _match_key(contract_address, token_id) -> tuple:
+    return (str(contract_address or "").lower(), str(token_id or ""))
+
+def _item_params(contract_address: str, token_id: str, blockchain: str) -> dict:
+    # The params of a single-item `get_nft_metadata` call, so both paths share cache entries.
+    return {"contract_address": [contract_address], "token_id": [token_id], "blockchain": blockchain}
+
+def _cached_metadata(cache, nfts: list, blockchain: str) -> tuple:
+    """Splits `nfts` into `({"contract:token": metadata}, pairs still to fetch)` using the response cache."""
+    found, missing = {}, []
+    for c, t in nfts:
+        response = cache.get(METADATA_ENDPOINT, _item_params(c, t, blockchain)) if cache is not None else None
+        items = (response or {}).get("data") or []
+        if items:
+            found[nft_identifier(c, t)] = items[0]
+        else:
+            missing.append((c, t))
+    return found, missing
+
+async def _fetch_chunk(client, chunk: list, blockchain: str, semaphore: asyncio.Semaphore) -> dict:
+    """
+    Fetches one chunk and maps each requested pair to its metadata, or `{"error": True}`.
+    Found items are cached one by one, so later requests reuse them in any combination.
+    """
+    async with semaphore:
+        try:
+            response = await client.get_nft_metadata_bulk(chunk, blockchain=blockchain)
+        except Exception as e:
+            logger.warning("Could not fetch metadata for a chunk of %d NFTs: %s", len(chunk), getattr(e, 'detail', e))
+            return {nft_identifier(c, t): {"error": True} for c, t in chunk}
+
+    by_key = {}
+    for item in (response or {}).get("data") or []:
+        if isinstance(item, dict):
+            by_key.setdefault(_match_key(item.get("contract_address"), item.get("token_id")), item)
+
+    cache = getattr(client, "cache", None)
+    results = {}
+    for c, t in chunk:
+        item = by_key.get(_match_key(c, t))
+        if item is not None and cache is not None:
+            cache.put(METADATA_ENDPOINT, _item_params(c, t, blockchain), {"data": [item]})
+        results[nft_identifier(c, t)] = item if item is not None else {"error": True}
+    return results
+
+async def iter_metadata_chunks(client, nfts: list, blockchain: str = "ethereum"):
+    """
+    Yields `{"contract:token": metadata}` dicts: first every pair already in the response
+    cache, then the rest packed into bulk upstream calls, one dict per chunk as it completes.
+    """
+    unique_nfts = list(dict.fromkeys((c, str(t)) for c, t in nfts))
+    if not unique_nfts:
+        return
+
+    cached, missing = _cached_metadata(getattr(client, "cache", None), unique_nfts, blockchain)
+    if cached:
+        yield cached
+
+    semaphore = asyncio.Semaphore(METADATA_CHUNK_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(_fetch_chunk(client, missing[i:i + METADATA_CHUNK_SIZE], blockchain, semaphore))
+        for i in range(0, len(missing), METADATA_CHUNK_SIZE)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def fetch_metadata_bulk(client, nfts: list, blockchain: str = "ethereum") -> dict:
+    enriched_nfts = {}
+    async for chunk_result in iter_metadata_chunks(client, nfts, blockchain):
+        enriched_nfts.update(chunk_result)
+    return enriched_nfts
@@ -0,0 +1,98 @@
+# ai-python/nft_portfolio.py
+
+import os
+import asyncio
+from nft_metadata import iter_metadata_chunks, nft_identifier
+from telemetry import get_logger
+
+logger = get_logger(__name__)
+
+PORTFOLIO_PAGE_SIZE = int(os.getenv("PORTFOLIO_PAGE_SIZE", "100"))
+PORTFOLIO_PAGE_CONCURRENCY = int(os.getenv("PORTFOLIO_PAGE_CONCURRENCY", "4"))
+PORTFOLIO_MAX_PAGES = int(os.getenv("PORTFOLIO_MAX_PAGES", "100"))
+
+async def fetch_portfolio_page(client, wallet_address: str, blockchain: str, offset: int) -> dict:
+    return await client.get_wallet_nft_balance(
+        wallet_address, blockchain=blockchain, limit=PORTFOLIO_PAGE_SIZE, offset=offset
+    ) or {}
+
+def _total_items(page: dict):
+    pagination = page.get("pagination")
+    if isinstance(pagination, dict) and pagination.get("total_items") is not None:
+        try:
+            return int(pagination["total_items"])
+        except (ValueError, TypeError):
+            return None
+    return None
+
+def _page_items(page: dict) -> list:
+    return [item for item in page.get("data") or [] if isinstance(item, dict)]
+
+async def iter_portfolio_pages(client, wallet_address: str, blockchain: str, first_page: dict):
+    """
+    Yields the holdings of each page in offset order, starting with `first_page`. When the
+    first page reports `pagination.total_items`, the remaining offsets are fetched concurrently
+    with at most PORTFOLIO_PAGE_CONCURRENCY pages in flight; otherwise pages are walked one
+    at a time until a short page.
+    """
+    items = _page_items(first_page)
+    yield items
+    total = _total_items(first_page)
+
+    if total is None:
+        offset = PORTFOLIO_PAGE_SIZE
+        for _ in range(1, PORTFOLIO_MAX_PAGES):
+            if len(items) < PORTFOLIO_PAGE_SIZE:
+                return
+            items = _page_items(await fetch_portfolio_page(client, wallet_address, blockchain, offset))
+            yield items
+            offset += PORTFOLIO_PAGE_SIZE
+        return
+
+    offsets = list(range(PORTFOLIO_PAGE_SIZE, total, PORTFOLIO_PAGE_SIZE))[:PORTFOLIO_MAX_PAGES - 1]
+    if len(offsets) == PORTFOLIO_MAX_PAGES - 1 and offsets[-1] + PORTFOLIO_PAGE_SIZE < total:
+        logger.warning("Portfolio for %s has %d items; only the first %d are returned.",
+                       wallet_address, total, PORTFOLIO_MAX_PAGES * PORTFOLIO_PAGE_SIZE)
+
+    # A sliding window keeps the output in offset order while only a few pages are held at once.
+    in_flight = []
+    try:
+        for offset in offsets:
+            in_flight.append(asyncio.ensure_future(fetch_portfolio_page(client, wallet_address, blockchain, offset)))
+            if len(in_flight) >= PORTFOLIO_PAGE_CONCURRENCY:
+                yield _page_items(await in_flight.pop(0))
+        while in_flight:
+            yield _page_items(await in_flight.pop(0))
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+async def iter_portfolio(client, wallet_address: str, blockchain: str, first_page: dict, include_metadata: bool = False):
+    """
+    Yields each distinct holding once (first occurrence wins, since offset pages can shift while
+    they are being read). With `include_metadata`, each page is joined with NFT metadata before
+    its holdings are yielded; metadata is cached per NFT for an hour, so holdings fetched before,
+    here or through /batch-nft-metadata, are not fetched again.
+    """
+    seen = set()
+    async for items in iter_portfolio_pages(client, wallet_address, blockchain, first_page):
+        page = []
+        for item in items:
+            key = (str(item.get("contract_address") or "").lower(), str(item.get("token_id") or ""))
+            if key not in seen:
+                seen.add(key)
+                page.append(item)
+
+        if include_metadata and page:
+            pairs = [(item.get("contract_address"), str(item.get("token_id"))) for item in page if item.get("contract_address")]
+            metadata = {}
+            async for chunk_result in iter_metadata_chunks(client, pairs, blockchain):
+                metadata.update(chunk_result)
+            # Copies, since the page dicts may be shared with the response cache.
+            page = [
+                {**item, "metadata": metadata.get(nft_identifier(item.get("contract_address"), str(item.get("token_id"))))}
+                for item in page
+            ]
+
+        for item in page:
+            yield item
@@ -1,39 +1,104 @@
 # ai-python/prompt_builder.py
 
-from langchain_core.prompts import ChatPromptTemplate
+import os
+from functools import lru_cache
+from report_templates import REPORT_TITLE, RISK_LINE, SECTION_SUMMARY, SECTION_INSIGHTS, SECTION_VERDICT, DISCLAIMER
 
-def build_llm_prompt_messages(processed_data: dict, wallet_address: str):
-    human_message_llm_input = processed_data['human_message_llm_input']
-    overall_risk_level = processed_data['overall_risk_level']
+# Upper bound on the wallet data block in the human message, in estimated tokens.
+PROMPT_CONTEXT_TOKEN_BUDGET = int(os.getenv("PROMPT_CONTEXT_TOKEN_BUDGET", "250"))
 
-    def escape(text: str) -> str:
-        return str(text).replace('{', '{{').replace('}', '}}')
+# Identical for every wallet, so the prefix is built once and the provider can reuse it.
+SYSTEM_PROMPT = f"""You are CrunchGuardian AI, an expert Web3 analyst. Write a concise due-diligence report in clean Markdown from the wallet data in the user message.
+**CRITICAL RULE: Never generate code, code snippets, filenames, or programming syntax. Respond in pure Markdown text.**
+Data lines are `key: value`. USD amounts start with $, volumes are in ETH, "recent only" means just the newest transactions were analyzed.
+Your report MUST contain ONLY these sections:
+{REPORT_TITLE.format(wallet_address="<wallet address>")}
+{RISK_LINE.format(overall_risk_level="<overall risk>")}
+{SECTION_SUMMARY}
+[1-2 sentence overview of the wallet's main characteristics.]
+{SECTION_INSIGHTS}
+[Elaborate on critical findings from the data.]
+{SECTION_VERDICT}
+[A final, concise expert opinion.]
+---
+{DISCLAIMER}"""
 
-    human_message_content = f"""
-    Analyze the following data summary for wallet address: {wallet_address}
-    --- DATA SUMMARY ---
-    {escape(human_message_llm_input['context_summary'])}
-    --- END OF SUMMARY ---
-    Based on all the details in the summary, generate a professional due-diligence report in Markdown format.
+@lru_cache(maxsize=None)
+def system_message():
+    # LangChain is imported on first use rather than when the service starts.
+    from langchain_core.messages import SystemMessage
+    return SystemMessage(content=SYSTEM_PROMPT)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English and numbers)."""
+    return (len(text) + 3) // 4
+
+def _history_lines(transaction_summary: dict) -> tuple:
+    if not transaction_summary:
+        return None, []
+    recent_only = "" if transaction_summary['history_complete'] else " (recent only)"
+    first_seen = (transaction_summary['first_seen'] or "?")[:10]
+    last_seen = (transaction_summary['last_seen'] or "?")[:10]
+    history = (
+        f"nft_history: {transaction_summary['total_transactions']:,} txns{recent_only}; "
+        f"buy/sell/other {transaction_summary['buy_count']:,}/{transaction_summary['sell_count']:,}/{transaction_summary['other_count']:,}; "
+        f"volume {transaction_summary['total_volume_eth']:,.4f} ETH; active {first_seen} to {last_seen}"
+    )
+    collections = [
+        f"{c['collection_name']} {c['volume_eth']:,.4f}" for c in transaction_summary['top_collections_by_volume']
+    ]
+    return history, collections
+
+def encode_wallet_context(analysis, max_tokens: int = PROMPT_CONTEXT_TOKEN_BUDGET) -> str:
     """
-    
-    system_prompt_content = f"""
-    You are CrunchGuardian AI, an expert Web3 analyst. Your goal is to provide a concise, high-level due-diligence report in clean Markdown.
-
-    **CRITICAL RULE: Under no circumstances should you generate code, code snippets, filenames, or programming syntax. Your response must be pure, clean Markdown text.**
-
-    Your report MUST contain ONLY these sections:
-    ### CrunchGuardian AI Report for {wallet_address}
-    **Overall Risk Assessment:** {overall_risk_level}
-    #### Summary
-    [1-2 sentence overview of the wallet's main characteristics.]
-    #### Additional Insights & Red Flags
-    [Elaborate on critical findings from the data summary.]
-    #### Analyst's Verdict
-    [A final, concise expert opinion.]
-    ---
-    **Important Disclaimer:** This report reflects the provided API data and is not investment advice.
+    Encodes the wallet analysis as short `key: value` lines. The core metrics and risk lines
+    are always kept; to fit `max_tokens`, top collections are dropped from the end first,
+    then the transaction history line.
     """
+    m, p, fm = analysis.metrics, analysis.profile, analysis.formatted_metrics
+
+    exposures = [
+        f"{label} ${value:,.2f}"
+        for label, value in (("sanctioned", m.sanction_volume), ("mixer", m.mixer_volume), ("illicit", m.illicit_volume))
+        if value > 0
+    ]
+    if p.washtrade_nft_count:
+        exposures.append(f"wash-traded NFTs {p.washtrade_nft_count:,}")
+
+    core_lines = [
+        f"flags: {'; '.join(analysis.risk_flags) or 'none'}",
+        f"profile: {p.wallet_type}; sanctioned {'yes' if p.aml_is_sanctioned else 'no'}; contract {'yes' if p.is_contract else 'no'}",
+        f"wallet: age {fm['walletAge']}; balance {fm['currentBalanceUsd']} ({fm['currentBalanceEth']}); "
+        f"txns {fm['totalTransactions']}; tokens {fm['uniqueTokensHeld']}; counterparties in/out {fm['inflowAddresses']}/{fm['outflowAddresses']}",
+        f"exposure: {'; '.join(exposures) or 'none'}",
+    ]
+    if analysis.missing_sources:
+        core_lines.append(f"unavailable: {', '.join(analysis.missing_sources)} (could not be fetched; zeros from it are unknown, not clean)")
+    history, collections = _history_lines(analysis.transaction_summary)
+
+    def render() -> str:
+        lines = list(core_lines)
+        if history:
+            lines.append(history)
+        if collections:
+            lines.append(f"top_collections: {'; '.join(collections)}")
+        return "\n".join(lines)
+
+    context = render()
+    while estimate_tokens(context) > max_tokens and (collections or history):
+        if collections:
+            collections.pop()
+        else:
+            history = None
+        context = render()
+    return context
 
-    prompt = ChatPromptTemplate.from_messages([("system", system_prompt_content), ("human", human_message_content)])
-    return prompt.format_messages()
\ No newline at end of file
+def build_llm_prompt_messages(processed_data, wallet_address: str):
+    """Returns the shared system message plus a human message carrying this wallet's data."""
+    from langchain_core.messages import HumanMessage
+    human_message_content = (
+        f"Wallet: {wallet_address}\n"
+        f"Overall risk: {processed_data['overall_risk_level']}\n"
+        f"{encode_wallet_context(processed_data)}"
+    )
+    return [system_message(), HumanMessage(content=human_message_content)]
@@ -0,0 +1,180 @@
+# ai-python/rate_limiter.py
+
+import os
+import math
+import time
+import random
+import asyncio
+from fastapi import HTTPException
+from telemetry import get_logger, UPSTREAM_RETRIES
+
+logger = get_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class BucketPaused(Exception):
+    """Raised by `TokenBucket.acquire` when the bucket is paused for longer than the caller will wait."""
+
+    def __init__(self, remaining: float):
+        super().__init__(f"paused for another {remaining:.1f}s")
+        self.remaining = remaining
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        # Nothing accrues while paused, so the bucket restarts empty when the pause ends.
+        now = time.monotonic()
+        elapsed = max(0.0, now - max(self.updated_at, self.paused_until))
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    async def _wait_until_idle(self, tokens: float):
+        # Nobody queued and a token spare; a pause is left to the normal path below.
+        while self.paused_until <= time.monotonic():
+            self._refill()
+            if not self._lock.locked() and self.tokens >= tokens:
+                return
+            await asyncio.sleep(1.0 / self.rate)
+
+    async def acquire(self, tokens: float = 1.0, max_pause: float = None, background: bool = False):
+        """
+        Waits for `tokens`. While the bucket is paused for more than `max_pause` seconds,
+        raises `BucketPaused` instead of waiting. A `background` caller only takes a spare
+        token while no one else is waiting, so it never queues ahead of other callers.
+        """
+        if background:
+            await self._wait_until_idle(tokens)
+        # The lock keeps waiters in FIFO order so a burst of callers is spread evenly.
+        async with self._lock:
+            while True:
+                remaining = self.paused_until - time.monotonic()
+                if remaining > 0:
+                    if max_pause is not None and remaining > max_pause:
+                        raise BucketPaused(remaining)
+                    await asyncio.sleep(remaining)
+                    continue
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Drains the bucket so nothing is sent for `seconds` (used for Retry-After)."""
+        self._refill()
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+def parse_retry_after(headers) -> float:
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (ValueError, TypeError):
+        return None
+
+class RateLimitScheduler:
+    """
+    Paces upstream calls with a token bucket per API key, bounds how many are in
+    flight at once, and retries throttled or failed calls with jittered exponential backoff.
+    Background calls yield the bucket to everything else and have their own concurrency cap.
+    """
+
+    def __init__(self, rate: float = 4.0, burst: float = 4.0, max_concurrency: int = 8,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 10.0,
+                 retry_after_max: float = 30.0, background_concurrency: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.background_semaphore = asyncio.Semaphore(background_concurrency)
+        self.buckets = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            rate=float(os.getenv("BITSCRUNCH_RATE_PER_SEC", "4")),
+            burst=float(os.getenv("BITSCRUNCH_RATE_BURST", "4")),
+            max_concurrency=int(os.getenv("BITSCRUNCH_MAX_CONCURRENCY", "8")),
+            max_retries=int(os.getenv("BITSCRUNCH_MAX_RETRIES", "3")),
+            backoff_base=float(os.getenv("BITSCRUNCH_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("BITSCRUNCH_BACKOFF_MAX", "10")),
+            retry_after_max=float(os.getenv("BITSCRUNCH_RETRY_AFTER_MAX", "30")),
+            background_concurrency=int(os.getenv("BITSCRUNCH_BACKGROUND_CONCURRENCY", "1")),
+        )
+
+    def bucket_for(self, key: str) -> TokenBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def backoff_delay(self, attempt: int) -> float:
+        # "Full jitter": a random delay up to the exponential cap for this attempt.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def run(self, key: str, call, background: bool = False):
+        """
+        Runs `call()` (a coroutine factory) under the limits for `key`. Errors carrying a
+        retryable `status_code` are retried; a `Retry-After` header on the error is honored in
+        full, and a Retry-After longer than `retry_after_max` is raised instead of waited out.
+        While the key is paused for longer than that, calls fail fast with a 429.
+        `background` calls (e.g. history ingest) run at most `background_concurrency` at a time
+        and only use tokens no foreground call is waiting for.
+        """
+        if background:
+            async with self.background_semaphore:
+                return await self._run(key, call, background=True)
+        return await self._run(key, call)
+
+    async def _run(self, key: str, call, background: bool = False):
+        bucket = self.bucket_for(key)
+        attempt = 0
+        while True:
+            try:
+                await bucket.acquire(max_pause=self.retry_after_max, background=background)
+            except BucketPaused as paused:
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"bitsCrunch API rate limit: requests are paused for another {paused.remaining:.0f}s.",
+                    headers={"Retry-After": str(math.ceil(paused.remaining))},
+                )
+            async with self.semaphore:
+                try:
+                    return await call()
+                except Exception as err:
+                    status_code = getattr(err, "status_code", None)
+                    if status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                        raise
+                    retry_after = parse_retry_after(getattr(err, "headers", None))
+                    if retry_after is not None and status_code == 429:
+                        # Other callers of this key wait out the window, or fail fast if it's over the limit.
+                        bucket.pause(retry_after)
+                    if retry_after is not None and retry_after > self.retry_after_max:
+                        logger.warning("Upstream asked to retry after %.0fs, over the %.0fs limit; giving up.", retry_after, self.retry_after_max)
+                        raise
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                delay = self.backoff_delay(attempt)
+            UPSTREAM_RETRIES.inc(status=str(status_code))
+            logger.warning("Upstream returned %s, retrying in %.2fs (attempt %d/%d)", status_code, delay, attempt + 1, self.max_retries)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+shared_scheduler = RateLimitScheduler.from_env()
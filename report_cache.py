@@ -0,0 +1,105 @@
+# ai-python/report_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+def report_cache_key(model_name: str, prompt_messages) -> str:
+    """Hashes the model name and the exact prompt sent to it."""
+    payload = [model_name] + [[message.type, message.content] for message in prompt_messages]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+class ReportCache:
+    """
+    SQLite-backed store of generated reports. Entries older than `max_age_seconds`
+    are dropped, and the least recently used ones go once the store exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, max_age_seconds: float = 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            path=os.getenv("REPORT_CACHE_PATH", os.path.join(current_dir, "report_cache.sqlite3")),
+            max_bytes=int(os.getenv("REPORT_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+            max_age_seconds=float(os.getenv("REPORT_CACHE_MAX_AGE", str(24 * 3600))),
+        )
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                " key TEXT PRIMARY KEY, report TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS reports_accessed_at ON reports (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _get(self, key: str):
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT report, created_at FROM reports WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            report, created_at = row
+            now = time.time()
+            if now - created_at > self.max_age_seconds:
+                conn.execute("DELETE FROM reports WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE reports SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return report
+
+    def _put(self, key: str, report: str):
+        size = len(report.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (key, report, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, report, size, now, now),
+            )
+            conn.execute("DELETE FROM reports WHERE created_at < ?", (now - self.max_age_seconds,))
+            total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+            if total_bytes > self.max_bytes:
+                # Walk the least recently used rows until enough bytes are freed.
+                excess = total_bytes - self.max_bytes
+                doomed = []
+                for row_key, row_size in conn.execute("SELECT key, size FROM reports ORDER BY accessed_at ASC"):
+                    if excess <= 0:
+                        break
+                    doomed.append((row_key,))
+                    excess -= row_size
+                conn.executemany("DELETE FROM reports WHERE key = ?", doomed)
+            conn.commit()
+
+    async def get(self, key: str):
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, report: str):
+        await asyncio.to_thread(self._put, key, report)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+report_cache = ReportCache.from_env()
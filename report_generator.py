@@ -1,56 +1,235 @@
 import asyncio
 import os
+import time
 from fastapi import HTTPException
 from api_client import BitsCrunchAPIClient
 from data_processor import process_and_format_data
-from llm_service import invoke_llm_chain
+from llm_service import invoke_llm_chain, stream_llm_chain
+from report_templates import use_template_report, render_template_report
+from transaction_ingest import fetch_transaction_page, wallet_history_summary, TRANSACTION_PAGE_SIZE
+from telemetry import get_logger, REPORT_STAGE_LATENCY
 
-bits_crunch_client = BitsCrunchAPIClient()
+logger = get_logger(__name__)
 
-async def generate_comprehensive_report(wallet_address: str):
+_bits_crunch_client = None
+
+def get_bits_crunch_client() -> BitsCrunchAPIClient:
+    """Returns the shared bitsCrunch client, creating it on first use (normally in the app lifespan)."""
+    global _bits_crunch_client
+    if _bits_crunch_client is None:
+        _bits_crunch_client = BitsCrunchAPIClient()
+    return _bits_crunch_client
+
+FETCH_TIMEOUTS = {
+    'metrics': float(os.getenv("REPORT_METRICS_TIMEOUT", "20")),
+    'profile': float(os.getenv("REPORT_PROFILE_TIMEOUT", "20")),
+    'wallet_nft_transactions': float(os.getenv("REPORT_TRANSACTIONS_TIMEOUT", "20")),
+}
+
+# How long /generate-report waits for a fresh history ingest before using the stored summary.
+REPORT_HISTORY_WAIT = float(os.getenv("REPORT_HISTORY_WAIT", "2"))
+RECENT_TRANSACTIONS_SHOWN = 10
+
+BATCH_FETCH_CONCURRENCY = int(os.getenv("BATCH_FETCH_CONCURRENCY", "16"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+MAX_BATCH_ADDRESSES = int(os.getenv("MAX_BATCH_ADDRESSES", "5000"))
+
+def _elapsed_ms(started_at: float) -> float:
+    return round((time.perf_counter() - started_at) * 1000, 1)
+
+def _record_timings(timings: dict):
+    for stage, elapsed_ms in timings.items():
+        REPORT_STAGE_LATENCY.observe(elapsed_ms / 1000, stage=stage)
+
+async def _fetch_source(key: str, task_func, timings: dict, missing_sources: list):
+    """
+    Fetches one source within its timeout. Failures fall back to `{}` like before, and the
+    source is added to `missing_sources`.
+    """
+    started_at = time.perf_counter()
     try:
-        all_wallet_data = {}
-
-        api_calls = [
-            ('metrics', lambda: bits_crunch_client.get_wallet_metrics(wallet_address, blockchain='ethereum')),
-            ('profile', lambda: bits_crunch_client.get_wallet_profile(wallet_address, blockchain='ethereum')),
-            ('wallet_nft_transactions', lambda: bits_crunch_client.get_nft_transactions(wallet_address=wallet_address, limit=10, sort_by='timestamp')),
-        ]
-
-        print("--- Starting Report Generation ---")
-        print("Step 1: Fetching API data from bitsCrunch...")
-        for key, task_func in api_calls:
-            try:
-                result = await task_func()
-                if key in ['metrics', 'profile']:
-                    all_wallet_data[key] = result.get('data', [{}])[0] if isinstance(result.get('data'), list) and result.get('data') else {}
-                else:
-                    all_wallet_data[key] = result.get('data', [])
-                print(f"  ✅ Successfully fetched '{key}'.")
-            except Exception as e:
-                error_detail = getattr(e, 'detail', str(e))
-                print(f"  ❌ [ERROR] Failed to fetch '{key}': {error_detail}")
-                all_wallet_data[key] = {} 
-
-        print("\nStep 2: Processing all fetched data...")
+        result = await asyncio.wait_for(task_func(), timeout=FETCH_TIMEOUTS[key])
+        if key in ['metrics', 'profile']:
+            value = result.get('data', [{}])[0] if isinstance(result.get('data'), list) and result.get('data') else {}
+        else:
+            value = result.get('data', [])
+        logger.debug("Successfully fetched '%s'.", key)
+    except asyncio.TimeoutError:
+        logger.error("Timed out fetching '%s' after %ss.", key, FETCH_TIMEOUTS[key])
+        value = {}
+        missing_sources.append(key)
+    except Exception as e:
+        error_detail = getattr(e, 'detail', str(e))
+        logger.error("Failed to fetch '%s': %s", key, error_detail)
+        value = {}
+        missing_sources.append(key)
+    timings[f"fetch_{key}"] = _elapsed_ms(started_at)
+    return value
+
+async def fetch_wallet_data(wallet_address: str, timings: dict, include_history: bool = True, history_wait: float = 0.0):
+    """
+    Fetches metrics, profile and recent transactions concurrently. Unless `include_history` is
+    off, the recent-transactions call fetches a full first history page, which is handed to a
+    background ingest of the whole history; its summary is awaited for at most `history_wait`
+    seconds, after which the last stored summary is used. Sources that failed or timed out
+    are listed under 'missing_sources'.
+    """
+    client = get_bits_crunch_client()
+    page_size = TRANSACTION_PAGE_SIZE if include_history else RECENT_TRANSACTIONS_SHOWN
+    api_calls = [
+        ('metrics', lambda: client.get_wallet_metrics(wallet_address, blockchain='ethereum')),
+        ('profile', lambda: client.get_wallet_profile(wallet_address, blockchain='ethereum')),
+        ('wallet_nft_transactions', lambda: fetch_transaction_page(client, wallet_address, page_size=page_size)),
+    ]
+    missing_sources = []
+    started_at = time.perf_counter()
+    results = await asyncio.gather(*(_fetch_source(key, task_func, timings, missing_sources) for key, task_func in api_calls))
+    wallet_data = {key: result for (key, _), result in zip(api_calls, results)}
+    wallet_data['missing_sources'] = [key for key, _ in api_calls if key in missing_sources]
+
+    transactions = wallet_data['wallet_nft_transactions']
+    wallet_data['wallet_nft_transactions'] = transactions[:RECENT_TRANSACTIONS_SHOWN] if isinstance(transactions, list) else transactions
+    if include_history:
+        history_started_at = time.perf_counter()
+        # A failed first page is left for the ingest to fetch itself.
+        first_page = {"data": transactions} if isinstance(transactions, list) and transactions else None
+        wallet_data['transaction_history'] = await wallet_history_summary(client, wallet_address, first_page, wait=history_wait)
+        timings["fetch_transaction_history"] = _elapsed_ms(history_started_at)
+    timings["fetch_total"] = _elapsed_ms(started_at)
+    return wallet_data
+
+def _deterministic_fields(processed_data: dict) -> dict:
+    """The parts of a report that are ready as soon as the wallet data is processed."""
+    return {
+        "overallRiskLevel": processed_data['overall_risk_level'],
+        "formattedMetrics": processed_data['formatted_metrics'],
+        "graph_data": processed_data['graph_data'],
+        "transactions": processed_data['transactions'],
+        "transactionSummary": processed_data['transaction_summary'],
+        "missingSources": processed_data['missing_sources'],
+    }
+
+async def generate_comprehensive_report(wallet_address: str, refresh: bool = False, report_mode: str = "auto"):
+    try:
+        timings = {}
+        report_started_at = time.perf_counter()
+
+        logger.info("Generating report for %s: fetching API data from bitsCrunch...", wallet_address)
+        all_wallet_data = await fetch_wallet_data(wallet_address, timings, history_wait=REPORT_HISTORY_WAIT)
+
+        started_at = time.perf_counter()
         processed_data = process_and_format_data(all_wallet_data, wallet_address)
-        print("  ✅ Data processed.")
+        timings["processing"] = _elapsed_ms(started_at)
 
-        print("\nStep 3: Invoking LLM for AI analysis...")
-        markdown_report = await invoke_llm_chain(processed_data, wallet_address)
-        print("  ✅ AI report generated.")
+        if use_template_report(processed_data['overall_risk_level'], report_mode, processed_data['missing_sources']):
+            logger.info("Rendering templated report for %s (LLM skipped).", wallet_address)
+            report_source = "template"
+            markdown_report = render_template_report(processed_data, wallet_address)
+        else:
+            logger.info("Invoking LLM for AI analysis of %s...", wallet_address)
+            report_source = "llm"
+            started_at = time.perf_counter()
+            markdown_report = await invoke_llm_chain(processed_data, wallet_address, refresh=refresh)
+            timings["llm"] = _elapsed_ms(started_at)
 
-        print("\n--- Report Generation Complete ---")
+        timings["total"] = _elapsed_ms(report_started_at)
+        _record_timings(timings)
+        logger.info("Report generation complete for %s, timings (ms): %s", wallet_address, timings)
         return {
             "report": markdown_report,
-            "overallRiskLevel": processed_data['overall_risk_level'],
-            "formattedMetrics": processed_data['formatted_metrics'],
-            "graph_data": processed_data['graph_data'],
-            "transactions": processed_data['transactions']
+            "reportSource": report_source,
+            **_deterministic_fields(processed_data),
+            "timings": timings
         }
 
     except Exception as e:
-        print(f"🔥🔥🔥 [FATAL ERROR] A critical error occurred in generate_comprehensive_report: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"An unexpected server error occurred. Check the logs. Error: {str(e)}")
\ No newline at end of file
+        logger.exception("A critical error occurred in generate_comprehensive_report: %s", e)
+        raise HTTPException(status_code=500, detail=f"An unexpected server error occurred. Check the logs. Error: {str(e)}")
+
+async def stream_comprehensive_report(wallet_address: str, refresh: bool = False, report_mode: str = "auto"):
+    """
+    Yields `(event, data)` pairs: "metrics" with the deterministic report fields, one
+    "token" per LLM chunk, then "done" with timings, or "error" if generation fails.
+    """
+    timings = {}
+    report_started_at = time.perf_counter()
+    try:
+        logger.info("Streaming report for %s...", wallet_address)
+        # The metrics event goes out without waiting on the history ingest; it uses the stored summary.
+        all_wallet_data = await fetch_wallet_data(wallet_address, timings)
+
+        started_at = time.perf_counter()
+        processed_data = process_and_format_data(all_wallet_data, wallet_address)
+        timings["processing"] = _elapsed_ms(started_at)
+        timings["first_byte"] = _elapsed_ms(report_started_at)
+        yield "metrics", _deterministic_fields(processed_data)
+
+        if use_template_report(processed_data['overall_risk_level'], report_mode, processed_data['missing_sources']):
+            report_source = "template"
+            yield "token", {"text": render_template_report(processed_data, wallet_address)}
+        else:
+            report_source = "llm"
+            started_at = time.perf_counter()
+            async for text in stream_llm_chain(processed_data, wallet_address, refresh=refresh):
+                timings.setdefault("llm_first_token", _elapsed_ms(started_at))
+                yield "token", {"text": text}
+            timings["llm"] = _elapsed_ms(started_at)
+
+        timings["total"] = _elapsed_ms(report_started_at)
+        _record_timings(timings)
+        logger.info("Streaming report complete for %s, timings (ms): %s", wallet_address, timings)
+        yield "done", {"reportSource": report_source, "timings": timings}
+
+    except Exception as e:
+        logger.exception("A critical error occurred in stream_comprehensive_report: %s", e)
+        yield "error", {"detail": getattr(e, 'detail', str(e))}
+
+async def _generate_batch_entry(wallet_address: str, refresh: bool, report_mode: str, fetch_semaphore: asyncio.Semaphore, llm_semaphore: asyncio.Semaphore):
+    """Builds one wallet's report. Any failure is returned as that wallet's result, never raised."""
+    timings = {}
+    try:
+        # Full-history ingestion is skipped here to keep large batches within the upstream quota.
+        async with fetch_semaphore:
+            all_wallet_data = await fetch_wallet_data(wallet_address, timings, include_history=False)
+        processed_data = process_and_format_data(all_wallet_data, wallet_address)
+
+        if use_template_report(processed_data['overall_risk_level'], report_mode, processed_data['missing_sources']):
+            report_source = "template"
+            markdown_report = render_template_report(processed_data, wallet_address)
+        else:
+            report_source = "llm"
+            async with llm_semaphore:
+                started_at = time.perf_counter()
+                markdown_report = await invoke_llm_chain(processed_data, wallet_address, refresh=refresh)
+                timings["llm"] = _elapsed_ms(started_at)
+
+        _record_timings(timings)
+        return {
+            "address": wallet_address,
+            "ok": True,
+            "report": markdown_report,
+            "reportSource": report_source,
+            **_deterministic_fields(processed_data),
+            "timings": timings
+        }
+    except Exception as e:
+        logger.error("Batch report failed for %s: %s", wallet_address, getattr(e, 'detail', str(e)))
+        return {"address": wallet_address, "ok": False, "error": getattr(e, 'detail', str(e))}
+
+async def generate_batch_reports(wallet_addresses: list, refresh: bool = False, report_mode: str = "auto"):
+    """
+    Generates reports for many wallets, yielding each result as soon as it finishes.
+    Upstream fetches and LLM calls run under separate concurrency caps.
+    """
+    fetch_semaphore = asyncio.Semaphore(BATCH_FETCH_CONCURRENCY)
+    llm_semaphore = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(_generate_batch_entry(address, refresh, report_mode, fetch_semaphore, llm_semaphore))
+        for address in dict.fromkeys(wallet_addresses)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
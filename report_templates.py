@@ -0,0 +1,75 @@
+# ai-python/report_templates.py
+
+import os
+
+# Risk levels that get a locally rendered report in "auto" mode, e.g. "Low Risk,Moderate Risk".
+TEMPLATE_RISK_LEVELS = {
+    level.strip() for level in os.getenv("TEMPLATE_REPORT_RISK_LEVELS", "Low Risk").split(",") if level.strip()
+}
+
+VERDICTS = {
+    "Low Risk": "Nothing in the available data points to elevated risk. Standard due diligence is sufficient for interacting with this wallet.",
+    "Moderate Risk": "The wallet shows activity that warrants attention. Review the flagged behaviour before transacting at size.",
+    "High Risk": "The wallet carries significant risk indicators. Enhanced due diligence is strongly recommended before any interaction.",
+}
+
+# Sources the risk assessment rests on; without them a clean result only means "no data".
+CORE_SOURCES = ("metrics", "profile")
+INCOMPLETE_VERDICT = "This assessment is incomplete because some wallet data could not be fetched. Regenerate the report before relying on it."
+
+# Report layout shared with the LLM system prompt in prompt_builder.py.
+REPORT_TITLE = "### CrunchGuardian AI Report for {wallet_address}"
+RISK_LINE = "**Overall Risk Assessment:** {overall_risk_level}"
+SECTION_SUMMARY = "#### Summary"
+SECTION_INSIGHTS = "#### Additional Insights & Red Flags"
+SECTION_VERDICT = "#### Analyst's Verdict"
+DISCLAIMER = "**Important Disclaimer:** This report reflects the provided API data and is not investment advice."
+
+def missing_core_sources(missing_sources) -> list:
+    return [source for source in CORE_SOURCES if source in (missing_sources or ())]
+
+def use_template_report(overall_risk_level: str, report_mode: str = "auto", missing_sources=()) -> bool:
+    if report_mode == "template":
+        return True
+    if report_mode == "llm":
+        return False
+    # A risk level computed without metrics or profile is not a clean bill of health.
+    return overall_risk_level in TEMPLATE_RISK_LEVELS and not missing_core_sources(missing_sources)
+
+def render_template_report(processed_data: dict, wallet_address: str) -> str:
+    """
+    Renders a report locally with the same sections the LLM is asked for in
+    `prompt_builder.SYSTEM_PROMPT`.
+    """
+    overall_risk_level = processed_data['overall_risk_level']
+    metrics = processed_data['formatted_metrics']
+    wallet_type = processed_data['summary_points']['Wallet Type']
+    missing_sources = processed_data.get('missing_sources') or []
+    missing_core = missing_core_sources(missing_sources)
+
+    insights = [f"- {flag}" for flag in processed_data.get('risk_flags', [])]
+    if metrics['totalWashTradedNfts'] != "0":
+        insights.append(f"- {metrics['totalWashTradedNfts']} NFTs held by this wallet were flagged as wash traded.")
+    if metrics['isContract'] == "Yes":
+        insights.append("- The address is a smart contract rather than an externally owned account.")
+    if not insights and not missing_core:
+        insights.append("- No red flags were detected: no sanctions exposure, mixer interaction or wash-traded NFTs.")
+    if missing_sources:
+        insights.append(f"- Some wallet data could not be fetched ({', '.join(missing_sources)}); values from it show as zero and are not reliable.")
+    verdict = INCOMPLETE_VERDICT if missing_core else VERDICTS.get(overall_risk_level, VERDICTS['High Risk'])
+    insights_text = "\n".join(insights)
+
+    return (
+        f"{REPORT_TITLE.format(wallet_address=wallet_address)}\n"
+        f"{RISK_LINE.format(overall_risk_level=overall_risk_level)}\n"
+        f"{SECTION_SUMMARY}\n"
+        f"This is a **{wallet_type}** wallet, active for {metrics['walletAge']}, holding {metrics['currentBalanceUsd']} "
+        f"({metrics['currentBalanceEth']}) across {metrics['uniqueTokensHeld']} unique tokens and "
+        f"{metrics['totalTransactions']} transactions.\n"
+        f"{SECTION_INSIGHTS}\n"
+        f"{insights_text}\n"
+        f"{SECTION_VERDICT}\n"
+        f"{verdict}\n"
+        f"---\n"
+        f"{DISCLAIMER}"
+    )
@@ -0,0 +1,151 @@
+# ai-python/response_cache.py
+
+import os
+import json
+import time
+import asyncio
+from collections import OrderedDict
+
+# Seconds each upstream endpoint's response stays fresh. Endpoints not listed are never cached.
+# Market insights are not listed: market_insights.MarketSnapshotStore keeps and refreshes those itself.
+DEFAULT_ENDPOINT_TTLS = {
+    "/wallet/metrics": 120,
+    "/nft/wallet/profile": 120,
+    "/nft/transactions": 30,
+    "/wallet/balance/nft": 60,
+    "/nft/metadata": 3600,
+}
+
+def _normalize(value):
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.lower() if value.startswith("0x") else value
+    return value
+
+def make_cache_key(endpoint: str, params: dict = None) -> str:
+    """Builds a stable key from the endpoint and its params, ignoring order and address case."""
+    normalized = {k: _normalize(v) for k, v in (params or {}).items() if v is not None}
+    return endpoint + "?" + json.dumps(normalized, sort_keys=True, default=str)
+
+class ResponseCache:
+    """
+    In-memory TTL cache for upstream JSON responses with LRU eviction bounded by
+    approximate payload size. Concurrent misses for the same key share one fetch.
+    """
+
+    def __init__(self, endpoint_ttls: dict = None, max_bytes: int = 32 * 1024 * 1024):
+        self.endpoint_ttls = dict(DEFAULT_ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls)
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (expires_at, size, value)
+        self.current_bytes = 0
+        self.inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.endpoint_ttls.get(endpoint, 0)
+
+    def _get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str):
+        _, size, _ = self.entries.pop(key)
+        self.current_bytes -= size
+
+    def _store(self, key: str, value, ttl: float):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (time.monotonic() + ttl, size, value)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            oldest_key = next(iter(self.entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def get(self, endpoint: str, params: dict = None):
+        """Returns the fresh cached response for (endpoint, params), or None."""
+        if self.ttl_for(endpoint) <= 0:
+            return None
+        entry = self._get(make_cache_key(endpoint, params))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[2]
+
+    def put(self, endpoint: str, params: dict, value):
+        """Stores `value` as the response for (endpoint, params), if the endpoint is cached."""
+        ttl = self.ttl_for(endpoint)
+        if ttl > 0:
+            self._store(make_cache_key(endpoint, params), value, ttl)
+
+    async def get_or_fetch(self, endpoint: str, params: dict, fetch, store: bool = True):
+        """
+        Returns the cached response for (endpoint, params), or awaits `fetch()` once for
+        every concurrent caller. Cached values are shared, so callers must not mutate them.
+        With `store` off, concurrent callers still share the fetch but the result isn't kept,
+        e.g. when the caller caches it in smaller pieces with `put`.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return await fetch()
+
+        key = make_cache_key(endpoint, params)
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[2]
+
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self.inflight[key] = task
+
+            def _on_done(done_task):
+                self.inflight.pop(key, None)
+                if store and not done_task.cancelled() and done_task.exception() is None:
+                    self._store(key, done_task.result(), ttl)
+            task.add_done_callback(_on_done)
+
+        # Shielded so one cancelled caller does not cancel the fetch for everyone else.
+        return await asyncio.shield(task)
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+shared_response_cache = ResponseCache.from_env()
@@ -0,0 +1,178 @@
+# ai-python/telemetry.py
+
+import os
+import time
+import queue
+import atexit
+import logging
+import functools
+from bisect import bisect_left
+from logging.handlers import QueueHandler, QueueListener
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+_callbacks = []
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(labelnames: tuple, labelvalues: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Fixed-bucket histogram; an observation is one bisect and a few integer adds."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, **labels):
+        """Context manager that observes the elapsed seconds of its block."""
+        return _Timer(self, labels)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bound_label = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, bound_label)} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            inf_label = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, inf_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started_at")
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started_at, **self.labels)
+        return False
+
+def timed(histogram: Histogram, **labels):
+    """Decorator observing each call's duration on `histogram`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def register_callback(name: str, documentation: str, metric_type: str, collect):
+    """
+    Registers a metric whose samples are read at scrape time. `collect()` returns a dict
+    mapping label tuples like `(("result", "hit"),)` to values.
+    """
+    _callbacks.append((name, documentation, metric_type, collect))
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for name, documentation, metric_type, collect in _callbacks:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in collect().items():
+            labelnames = tuple(name for name, _ in labels)
+            labelvalues = tuple(value for _, value in labels)
+            lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+# --- Metrics shared across the service ---
+UPSTREAM_LATENCY = Histogram(
+    "bitscrunch_request_duration_seconds", "Duration of bitsCrunch API calls, per attempt.", ("endpoint", "status"))
+UPSTREAM_RETRIES = Counter(
+    "bitscrunch_retries_total", "bitsCrunch calls retried by the rate-limit scheduler.", ("status",))
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "Duration of LLM report generation.", ("mode",))
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens reported by the LLM provider.", ("kind",))
+REPORT_CACHE_LOOKUPS = Counter(
+    "report_cache_lookups_total", "Stored AI report lookups.", ("result",))
+PROCESSING_LATENCY = Histogram(
+    "wallet_processing_duration_seconds", "Time spent in process_and_format_data.")
+REPORT_STAGE_LATENCY = Histogram(
+    "report_stage_duration_seconds", "Per-stage latency of report generation.", ("stage",))
+
+# --- Non-blocking logging: records are queued on the hot path and written by a background thread ---
+_listener = None
+_queue_handler = None
+
+def setup_logging():
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    _queue_handler = QueueHandler(log_queue)
+    root = logging.getLogger("crunchguardian")
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(_queue_handler)
+    root.propagate = False
+
+def shutdown_logging():
+    """Flushes queued records and stops the writer thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger("crunchguardian").removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
+
+def get_logger(name: str) -> logging.Logger:
+    setup_logging()
+    return logging.getLogger(f"crunchguardian.{name}")
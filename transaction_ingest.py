@@ -0,0 +1,306 @@
+# ai-python/transaction_ingest.py
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+from datetime import datetime, timezone
+from wallet_records import safe_float
+from telemetry import get_logger
+
+logger = get_logger(__name__)
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+TRANSACTION_PAGE_SIZE = int(os.getenv("TRANSACTION_PAGE_SIZE", "100"))
+TRANSACTION_MAX_PAGES = int(os.getenv("TRANSACTION_MAX_PAGES", "20"))
+MAX_TRACKED_COLLECTIONS = int(os.getenv("TRANSACTION_MAX_TRACKED_COLLECTIONS", "500"))
+OTHER_COLLECTIONS = "Other collections"
+
+def parse_timestamp(value):
+    """Parses epoch seconds/milliseconds or ISO-8601 strings into an aware UTC datetime."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace(".", "", 1).isdigit()):
+        seconds = float(value)
+        if seconds > 1e11:
+            seconds /= 1000
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def transaction_id(tx: dict) -> str:
+    return str(tx.get("transaction_hash") or tx.get("hash") or json.dumps(tx, sort_keys=True, default=str))
+
+async def fetch_transaction_page(client, wallet_address: str, page: int = 0, page_size: int = TRANSACTION_PAGE_SIZE,
+                                 background: bool = False) -> dict:
+    """One page of a wallet's NFT transactions, newest first."""
+    return await client.get_nft_transactions(
+        wallet_address=wallet_address, limit=page_size, offset=page * page_size,
+        sort_by='timestamp', sort_order='desc', background=background
+    )
+
+async def iter_wallet_transaction_pages(client, wallet_address: str, page_size: int = TRANSACTION_PAGE_SIZE,
+                                        max_pages: int = TRANSACTION_MAX_PAGES, first_page: dict = None,
+                                        background: bool = False):
+    """
+    Pages through a wallet's NFT transactions, newest first, yielding each page's list of
+    transactions. `first_page`, if given, is used instead of fetching page 0. Stops after a
+    short page or `max_pages`; close the generator early to stop sooner. `background` pages
+    are fetched at background priority (see `RateLimitScheduler.run`).
+    """
+    for page in range(max_pages):
+        if page == 0 and first_page is not None:
+            response = first_page
+        else:
+            response = await fetch_transaction_page(client, wallet_address, page, page_size, background=background)
+        data = (response or {}).get('data') or []
+        yield [tx for tx in data if isinstance(tx, dict)]
+        if len(data) < page_size:
+            return
+
+class TransactionAggregator:
+    """
+    Streaming totals over a transaction history: buy/sell counts, ETH volume per collection
+    and transaction counts per month. Memory stays bounded by the collection cap and the
+    number of months, not by the number of transactions.
+    """
+
+    __slots__ = (
+        "total_count", "buy_count", "sell_count", "other_count", "total_volume_eth",
+        "volume_by_collection", "count_by_month", "newest_timestamp", "newest_ids",
+        "oldest_timestamp", "history_complete",
+    )
+
+    def __init__(self):
+        self.total_count = 0
+        self.buy_count = 0
+        self.sell_count = 0
+        self.other_count = 0
+        self.total_volume_eth = 0.0
+        self.volume_by_collection = {}
+        self.count_by_month = {}
+        self.newest_timestamp = None
+        self.newest_ids = []
+        self.oldest_timestamp = None
+        self.history_complete = False
+
+    def is_seen(self, tx: dict, timestamp: datetime) -> bool:
+        """True if `tx` is at or before the checkpoint, i.e. already counted by an earlier run."""
+        if self.newest_timestamp is None or timestamp is None:
+            return False
+        newest = datetime.fromisoformat(self.newest_timestamp)
+        return timestamp < newest or (timestamp == newest and transaction_id(tx) in self.newest_ids)
+
+    def add(self, tx: dict, timestamp: datetime):
+        self.total_count += 1
+        transaction_type = str(tx.get("transaction_type") or "").lower()
+        if transaction_type == "buy":
+            self.buy_count += 1
+        elif transaction_type == "sell":
+            self.sell_count += 1
+        else:
+            self.other_count += 1
+
+        price_eth = safe_float(tx.get("price_eth"))
+        self.total_volume_eth += price_eth
+        collection_name = tx.get("collection_name")
+        collection = collection_name if collection_name and collection_name != "N/A" else tx.get("contract_address") or "Unknown"
+        if collection not in self.volume_by_collection and len(self.volume_by_collection) >= MAX_TRACKED_COLLECTIONS:
+            collection = OTHER_COLLECTIONS
+        self.volume_by_collection[collection] = self.volume_by_collection.get(collection, 0.0) + price_eth
+
+        if timestamp is not None:
+            month = timestamp.strftime("%Y-%m")
+            self.count_by_month[month] = self.count_by_month.get(month, 0) + 1
+            iso = timestamp.isoformat()
+            if self.oldest_timestamp is None or timestamp < datetime.fromisoformat(self.oldest_timestamp):
+                self.oldest_timestamp = iso
+
+    def advance_checkpoint(self, newest: datetime, newest_ids: list):
+        if newest is None:
+            return
+        if self.newest_timestamp is None or newest > datetime.fromisoformat(self.newest_timestamp):
+            self.newest_timestamp = newest.isoformat()
+            self.newest_ids = newest_ids
+        elif newest == datetime.fromisoformat(self.newest_timestamp):
+            self.newest_ids = sorted(set(self.newest_ids) | set(newest_ids))
+
+    def to_state(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_state(cls, state: dict):
+        aggregator = cls()
+        for name in cls.__slots__:
+            if name in state:
+                setattr(aggregator, name, state[name])
+        return aggregator
+
+    def summary(self, top_collections: int = 5) -> dict:
+        top = sorted(self.volume_by_collection.items(), key=lambda item: item[1], reverse=True)[:top_collections]
+        return {
+            "total_transactions": self.total_count,
+            "buy_count": self.buy_count,
+            "sell_count": self.sell_count,
+            "other_count": self.other_count,
+            "total_volume_eth": round(self.total_volume_eth, 6),
+            "top_collections_by_volume": [{"collection_name": name, "volume_eth": round(volume, 6)} for name, volume in top],
+            "transactions_by_month": dict(sorted(self.count_by_month.items())),
+            "first_seen": self.oldest_timestamp,
+            "last_seen": self.newest_timestamp,
+            "history_complete": self.history_complete,
+        }
+
+class CheckpointStore:
+    """SQLite store of per-wallet aggregator state, so later runs only fetch newer pages."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.getenv("TRANSACTION_CHECKPOINT_PATH", os.path.join(current_dir, "transaction_checkpoints.sqlite3")))
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (wallet TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load(self, wallet_address: str):
+        with self._lock:
+            row = self._connection().execute("SELECT state FROM checkpoints WHERE wallet = ?", (wallet_address.lower(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _save(self, wallet_address: str, state: dict):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (wallet, state, updated_at) VALUES (?, ?, ?)",
+                (wallet_address.lower(), json.dumps(state), time.time()),
+            )
+            conn.commit()
+
+    async def load(self, wallet_address: str):
+        return await asyncio.to_thread(self._load, wallet_address)
+
+    async def save(self, wallet_address: str, state: dict):
+        await asyncio.to_thread(self._save, wallet_address, state)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+checkpoint_store = CheckpointStore.from_env()
+
+async def ingest_wallet_transactions(client, wallet_address: str, max_pages: int = TRANSACTION_MAX_PAGES, first_page: dict = None) -> dict:
+    """
+    Folds a wallet's transaction history into its checkpointed aggregate, fetching only
+    pages newer than the last run, and returns the updated summary. Pages are fetched at
+    background priority so they never hold up report fetches.
+    """
+    state = await checkpoint_store.load(wallet_address)
+    aggregator = TransactionAggregator.from_state(state) if state else TransactionAggregator()
+    is_first_run = state is None
+
+    newest, newest_ids = None, []
+    # Offsets shift when new transactions arrive mid-run, so a page can repeat the previous one's tail.
+    counted_ids = set()
+    fetched = 0
+    pages_read, last_page_size = 0, 0
+    reached_checkpoint = False
+    pages = iter_wallet_transaction_pages(client, wallet_address, max_pages=max_pages, first_page=first_page, background=True)
+    try:
+        async for page in pages:
+            pages_read, last_page_size = pages_read + 1, len(page)
+            for tx in page:
+                timestamp = parse_timestamp(tx.get("timestamp"))
+                if timestamp is None and not is_first_run:
+                    # Undated transactions cannot be placed against the checkpoint; only the first run counts them.
+                    continue
+                if aggregator.is_seen(tx, timestamp):
+                    reached_checkpoint = True
+                    break
+                tx_id = transaction_id(tx)
+                if tx_id in counted_ids:
+                    continue
+                counted_ids.add(tx_id)
+                fetched += 1
+                aggregator.add(tx, timestamp)
+                if timestamp is not None:
+                    if newest is None or timestamp > newest:
+                        newest, newest_ids = timestamp, [tx_id]
+                    elif timestamp == newest:
+                        newest_ids.append(tx_id)
+            if reached_checkpoint:
+                break
+    finally:
+        await pages.aclose()
+
+    # Budget counted in pages read, not transactions kept, since skipped undated ones still used a page.
+    budget_exhausted = not reached_checkpoint and pages_read >= max_pages and last_page_size >= TRANSACTION_PAGE_SIZE
+    if is_first_run:
+        # The whole history was read unless the page budget ran out first.
+        aggregator.history_complete = not budget_exhausted
+    elif budget_exhausted:
+        # More new transactions than the page budget: there is now a gap behind the ones we read.
+        aggregator.history_complete = False
+    aggregator.advance_checkpoint(newest, newest_ids)
+
+    if fetched or is_first_run:
+        await checkpoint_store.save(wallet_address, aggregator.to_state())
+    logger.info("Ingested %d new transactions for %s (%d total).", fetched, wallet_address, aggregator.total_count)
+    return aggregator.summary()
+
+_ingest_tasks = {}
+
+def _ingest_finished(key: str, task: asyncio.Task):
+    _ingest_tasks.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Transaction history ingest failed for %s: %s", key, getattr(task.exception(), 'detail', task.exception()))
+
+def start_wallet_ingest(client, wallet_address: str, first_page: dict = None) -> asyncio.Task:
+    """Starts (or joins) the background ingest for a wallet; concurrent reports share one run."""
+    key = wallet_address.lower()
+    task = _ingest_tasks.get(key)
+    if task is None:
+        task = asyncio.ensure_future(ingest_wallet_transactions(client, wallet_address, first_page=first_page))
+        _ingest_tasks[key] = task
+        task.add_done_callback(lambda done: _ingest_finished(key, done))
+    return task
+
+async def wallet_history_summary(client, wallet_address: str, first_page: dict = None, wait: float = 0.0) -> dict:
+    """
+    Starts a background ingest and waits up to `wait` seconds for its summary. If it is still
+    running (or failed), returns the last stored summary, `{}` for a wallet never ingested.
+    The ingest keeps running either way, so a slow history never holds up a report.
+    """
+    task = start_wallet_ingest(client, wallet_address, first_page)
+    if wait > 0:
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), wait)
+        except Exception:
+            pass  # Timed out or failed; failures are logged by _ingest_finished.
+    state = await checkpoint_store.load(wallet_address)
+    return TransactionAggregator.from_state(state).summary() if state else {}
+
+async def stop_ingest_tasks():
+    """Cancels in-flight ingests at shutdown; each run saves only on completion, so nothing is half-written."""
+    tasks = list(_ingest_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
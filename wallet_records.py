@@ -0,0 +1,174 @@
+# ai-python/wallet_records.py
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+def safe_float(value, default=0.0):
+    """Safely convert a value to float, handling None, strings, or numbers."""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+def _safe_int(value) -> int:
+    return int(safe_float(value))
+
+def _yes_no(flag: bool) -> str:
+    return "Yes" if flag else "No"
+
+def format_wallet_age(days: int) -> str:
+    if days < 30: return f"{days} days"
+    if days < 365: return f"{days // 30} months, {days % 30} days"
+    return f"{days // 365} years, {(days % 365) // 30} months"
+
+@dataclass(slots=True)
+class WalletMetrics:
+    in_txn: int = 0
+    out_txn: int = 0
+    total_txn: int = 0
+    token_cnt: int = 0
+    inflow_addresses: int = 0
+    outflow_addresses: int = 0
+    wallet_age_days: int = 0
+    sanction_volume: float = 0.0
+    mixer_volume: float = 0.0
+    illicit_volume: float = 0.0
+    balance_wei: float = 0.0
+    balance_usd: float = 0.0
+
+    @classmethod
+    def from_dict(cls, metrics: dict):
+        return cls(
+            in_txn=_safe_int(metrics.get('in_txn')),
+            out_txn=_safe_int(metrics.get('out_txn')),
+            total_txn=_safe_int(metrics.get('total_txn')),
+            token_cnt=_safe_int(metrics.get('token_cnt')),
+            inflow_addresses=_safe_int(metrics.get('inflow_addresses')),
+            outflow_addresses=_safe_int(metrics.get('outflow_addresses')),
+            wallet_age_days=_safe_int(metrics.get('wallet_age')),
+            sanction_volume=safe_float(metrics.get('sanction_volume')),
+            mixer_volume=safe_float(metrics.get('mixer_volume')),
+            illicit_volume=safe_float(metrics.get('illicit_volume')),
+            balance_wei=safe_float(metrics.get('balance', '0')),
+            balance_usd=safe_float(metrics.get('balance_usd')),
+        )
+
+    @property
+    def balance_eth(self) -> float:
+        return self.balance_wei / 1e18
+
+@dataclass(slots=True)
+class WalletProfile:
+    washtrade_nft_count: int = 0
+    aml_is_sanctioned: bool = False
+    is_shark: bool = False
+    is_whale: bool = False
+    is_contract: bool = False
+
+    @classmethod
+    def from_dict(cls, profile: dict):
+        return cls(
+            washtrade_nft_count=_safe_int(profile.get('washtrade_nft_count')),
+            aml_is_sanctioned=bool(profile.get('aml_is_sanctioned', False)),
+            is_shark=bool(profile.get('is_shark', False)),
+            is_whale=bool(profile.get('is_whale', False)),
+            is_contract=bool(profile.get('is_contract', False)),
+        )
+
+    @property
+    def wallet_type(self) -> str:
+        return "Whale" if self.is_whale else ("Shark" if self.is_shark else "Standard")
+
+@dataclass(slots=True)
+class TransactionRecord:
+    type: str
+    collection_name: str
+    price_eth: Any
+    timestamp: Any
+
+    @classmethod
+    def from_dict(cls, tx: dict) -> Optional["TransactionRecord"]:
+        """Returns None for transactions with neither a collection name nor a contract address."""
+        collection_name = tx.get("collection_name")
+        display_name = collection_name if collection_name and collection_name != "N/A" else tx.get("contract_address")
+        if not display_name:
+            return None
+        return cls(
+            type=tx.get("transaction_type", "Unknown").capitalize(),
+            collection_name=display_name,
+            price_eth=tx.get("price_eth"),
+            timestamp=tx.get("timestamp"),
+        )
+
+# Keys readable with `analysis[key]`, matching the dict `process_and_format_data` used to return.
+PROCESSED_DATA_KEYS = frozenset({
+    "formatted_metrics", "overall_risk_level", "risk_flags", "summary_points", "graph_data",
+    "transactions", "transaction_summary", "report", "missing_sources",
+})
+
+@dataclass(slots=True)
+class WalletAnalysis:
+    """
+    Parsed wallet data plus its risk assessment. Presentation strings (formatted metrics,
+    summary report) are only built when first read.
+    """
+    wallet_address: str
+    metrics: WalletMetrics
+    profile: WalletProfile
+    overall_risk_level: str
+    risk_flags: list
+    transactions: list
+    transaction_summary: dict
+    missing_sources: list = field(default_factory=list)
+    _formatted_metrics: Optional[dict] = field(default=None, repr=False)
+
+    def __getitem__(self, key: str):
+        if key not in PROCESSED_DATA_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in PROCESSED_DATA_KEYS else default
+
+    @property
+    def formatted_metrics(self) -> dict:
+        if self._formatted_metrics is None:
+            m, p = self.metrics, self.profile
+            self._formatted_metrics = {
+                "walletAge": format_wallet_age(m.wallet_age_days), "currentBalanceUsd": f"${m.balance_usd:,.2f}", "currentBalanceEth": f"{m.balance_eth:,.4f} ETH",
+                "totalTransactions": f"{m.total_txn:,}", "uniqueTokensHeld": f"{m.token_cnt:,}", "inflowAddresses": f"{m.inflow_addresses:,}",
+                "outflowAddresses": f"{m.outflow_addresses:,}", "sanctionVolumeMetrics": f"${m.sanction_volume:,.2f}",
+                "mixerVolumeMetrics": f"${m.mixer_volume:,.2f}", "totalWashTradedNfts": f"{p.washtrade_nft_count:,}",
+                "isShark": _yes_no(p.is_shark), "isWhale": _yes_no(p.is_whale), "isContract": _yes_no(p.is_contract),
+            }
+        return self._formatted_metrics
+
+    @property
+    def summary_points(self) -> dict:
+        return {
+            "Wallet Type": self.profile.wallet_type,
+            "Primary Risk Factor": self.risk_flags[0] if self.risk_flags else "None Detected",
+            "Sanctioned": _yes_no(self.profile.aml_is_sanctioned),
+        }
+
+    @property
+    def graph_data(self) -> dict:
+        m = self.metrics
+        graph_data = {}
+        if m.in_txn > 0 or m.out_txn > 0:
+            graph_data["transaction_breakdown_chart"] = { "labels": ["Inflow Txns", "Outflow Txns"], "values": [m.in_txn, m.out_txn] }
+        if m.sanction_volume + m.mixer_volume + m.illicit_volume > 0:
+            graph_data["risk_composition_chart"] = { "labels": ["Sanctioned", "Mixer", "Illicit"], "values": [m.sanction_volume, m.mixer_volume, m.illicit_volume] }
+        return graph_data
+
+    @property
+    def report(self) -> str:
+        summary_points = self.summary_points
+        return (
+            f"### Whale Profile Summary\n\n"
+            f"**Overall Risk Assessment:** {self.overall_risk_level}\n\n"
+            f"This wallet is classified as a **{summary_points['Wallet Type']}**. "
+            f"The primary risk factor identified is: **{summary_points['Primary Risk Factor']}**."
+        )